@@ -0,0 +1,27 @@
+"""add inscription username/is_active index
+
+Revision ID: 6b2f4c1d9e7a
+Revises: 0da1bb5ca4c5
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2f4c1d9e7a'
+down_revision = '0da1bb5ca4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_transbankoneclick_oneclick_inscriptions_username_is_active'), 'oneclick_inscriptions', ['username', 'is_active'], unique=False, schema='transbankoneclick')
+    # username leads the composite index, so the single-column one is redundant
+    op.drop_index(op.f('ix_transbankoneclick_oneclick_inscriptions_username'), table_name='oneclick_inscriptions', schema='transbankoneclick')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transbankoneclick_oneclick_inscriptions_username'), 'oneclick_inscriptions', ['username'], unique=False, schema='transbankoneclick')
+    op.drop_index(op.f('ix_transbankoneclick_oneclick_inscriptions_username_is_active'), table_name='oneclick_inscriptions', schema='transbankoneclick')
@@ -22,6 +22,7 @@ setup(
     exclude_package_data={"": ["alembic/*", "alembic.ini"]},
     install_requires=[
         "fastapi==0.104.1",
+        "orjson==3.9.10",
         "uvicorn[standard]==0.24.0",
         "transbank-sdk==6.1.0",
         "python-multipart==0.0.6",
@@ -35,6 +36,7 @@ setup(
             "pytest-cov==4.1.0",
             "pytest-mock==3.12.0",
             "pytest-asyncio==0.21.1",
+            "pytest-xdist==3.5.0",
             "httpx==0.25.2",
             "black==23.11.0",
             "flake8==6.1.0",
@@ -0,0 +1,23 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from transbank_oneclick_api.services import transbank_service as svc
+
+
+@pytest.fixture
+def tb_mocks(monkeypatch):
+    """Replace the Transbank SDK calls used by the service with MagicMocks"""
+    mocks = SimpleNamespace(
+        start=MagicMock(),
+        finish=MagicMock(),
+        delete=MagicMock(),
+        authorize=MagicMock(),
+        status=MagicMock()
+    )
+    monkeypatch.setattr(svc.MallInscription, "start", mocks.start)
+    monkeypatch.setattr(svc.MallInscription, "finish", mocks.finish)
+    monkeypatch.setattr(svc.MallInscription, "delete", mocks.delete)
+    monkeypatch.setattr(svc.MallTransaction, "authorize", mocks.authorize)
+    monkeypatch.setattr(svc.MallTransaction, "status", mocks.status)
+    return mocks
@@ -1,14 +1,23 @@
+import asyncio
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, Mock
 from fastapi.testclient import TestClient
 
 
+class _FakeDT:
+    """Stand-in for the SDK's transaction_date that only supports isoformat()"""
+    def isoformat(self):
+        return "2023-03-20T10:30:00Z"
+
+
+_FAKE_DT = _FakeDT()
+
+
 class TestInscriptionAPI:
     
-    @patch('transbank_oneclick_api.services.transbank_service.MallInscription.start')
-    def test_start_inscription_success(self, mock_start, client, sample_inscription_data):
+    def test_start_inscription_success(self, tb_mocks, client, sample_inscription_data):
         # Arrange
-        mock_start.return_value = {
+        tb_mocks.start.return_value = {
             "token": "test_token_123",
             "url_webpay": "https://webpay.transbank.cl/test"
         }
@@ -46,11 +55,12 @@ class TestInscriptionAPI:
         # Validation errors can return either FastAPI's default format or custom format
         data = response.json()
         assert "detail" in data or "code" in data
+        fields = {e["field"] for e in data["data"]["validation_errors"]}
+        assert {"body.username", "body.email"} <= fields
     
-    @patch('transbank_oneclick_api.services.transbank_service.MallInscription.finish')
-    def test_finish_inscription_success(self, mock_finish, client, db_session):
+    def test_finish_inscription_success(self, tb_mocks, client, db_session):
         # Arrange
-        mock_finish.return_value = {
+        tb_mocks.finish.return_value = {
             "response_code": 0,
             "tbk_user": "dd@dd.cl",
             "authorization_code": "auth_123",
@@ -85,12 +95,65 @@ class TestInscriptionAPI:
         assert data["data"]["username"] == "testuser"
         assert data["data"]["inscriptions"] == []
         assert data["data"]["total_inscriptions"] == 0
+    
+    def test_list_inscriptions_returns_cards(self, client, db_session):
+        # Arrange
+        from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
+        from datetime import datetime
+        
+        db_session.add(OneclickInscription(
+            username="carduser",
+            tbk_user="tbk_list_123",
+            card_number_masked="****6623",
+            inscription_date=datetime(2024, 1, 1),
+            is_active=True
+        ))
+        db_session.flush()
+        
+        # Act
+        response = client.get("/api/v1/oneclick/mall/inscription/carduser")
+        
+        # Assert
+        assert response.status_code == 200
+        inscriptions = response.json()["data"]["inscriptions"]
+        assert len(inscriptions) == 1
+        assert inscriptions[0]["tbk_user"] == "tbk_list_123"
+        assert inscriptions[0]["card_type"] == "UNKNOWN"
+        assert inscriptions[0]["card_number"] == "****6623"
+        assert inscriptions[0]["status"] == "active"
+        assert inscriptions[0]["is_default"] is False
 
+    
+    def test_delete_inscription_success(self, tb_mocks, client, db_session):
+        # Arrange
+        from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
+        from datetime import datetime
+        
+        inscription = OneclickInscription(
+            username="deleteuser",
+            tbk_user="tbk_delete_123",
+            inscription_date=datetime(2024, 1, 1),
+            is_active=True
+        )
+        db_session.add(inscription)
+        db_session.flush()
+        
+        # Act
+        response = client.request(
+            "DELETE",
+            "/api/v1/oneclick/mall/inscription/delete",
+            json={"username": "deleteuser"}
+        )
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["code"] == "00"
+        tb_mocks.delete.assert_called_once_with("tbk_delete_123", "deleteuser")
+        assert inscription.is_active is False
 
 class TestTransactionAPI:
     
-    @patch('transbank_oneclick_api.services.transbank_service.MallTransaction.authorize')
-    def test_authorize_transaction_success(self, mock_authorize, client, db_session, sample_transaction_data):
+    def test_authorize_transaction_success(self, tb_mocks, client, db_session, sample_transaction_data):
         # Arrange - First create a mock inscription
         from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
         import uuid
@@ -114,12 +177,12 @@ class TestTransactionAPI:
         db_session.flush()
         
         # Mock Transbank response
-        mock_authorize.return_value = {
+        tb_mocks.authorize.return_value = {
             "parent_buy_order": sample_transaction_data["parent_buy_order"],
             "session_id": "session_123",
             "card_detail": {"card_number": "XXXX-XXXX-XXXX-1234"},
             "accounting_date": "0320",
-            "transaction_date": type("dt", (), {"isoformat": lambda self: "2023-03-20T10:30:00Z"})(),
+            "transaction_date": _FAKE_DT,
             "details": [
                 {
                     "amount": 10000,
@@ -210,6 +273,180 @@ class TestTransactionAPI:
         assert data["data"]["pagination"]["total"] == 0
 
 
+class TestCallbackAPI:
+
+    def test_inscription_result_success(self, tb_mocks, client):
+        # Arrange
+        tb_mocks.finish.return_value = {
+            "response_code": 0,
+            "tbk_user": "tbk_user_token_1234567890",
+            "authorization_code": "auth_123",
+            "card_type": "VISA",
+            "card_number": "XXXX-XXXX-XXXX-1234"
+        }
+
+        # Act
+        response = client.get(
+            "/api/v1/callbacks/inscription/result",
+            params={"TBK_TOKEN": "token_success_1234567890"}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert "Inscripción Exitosa" in response.text
+        assert "<strong>Usuario:</strong> test_username</p>" in response.text
+        assert "<strong>Tipo de tarjeta:</strong> VISA</p>" in response.text
+        assert "<strong>Número:</strong> XXXX-XXXX-XXXX-1234</p>" in response.text
+        assert "<strong>Código de autorización:</strong> auth_123</p>" in response.text
+        assert "<strong>TBK User:</strong> tbk_user_token_...</p>" in response.text
+
+    def test_inscription_result_rejected(self, tb_mocks, client):
+        # Arrange
+        tb_mocks.finish.return_value = {"response_code": -1}
+        
+        # Act
+        response = client.get(
+            "/api/v1/callbacks/inscription/result",
+            params={"TBK_TOKEN": "token_rejected_1234567890"}
+        )
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["cache-control"] == "no-store"
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert "Error en Inscripción" in response.text
+        assert "token_rejected_" in response.text
+    
+    def test_inscription_result_error_escapes_token(self, tb_mocks, client):
+        # Arrange
+        tb_mocks.finish.side_effect = Exception("Connection error")
+        
+        # Act
+        response = client.get(
+            "/api/v1/callbacks/inscription/result",
+            params={"TBK_TOKEN": "<b>x</b>"}
+        )
+        
+        # Assert
+        assert response.status_code == 200
+        assert "Error del Sistema" in response.text
+        assert "&lt;b&gt;x&lt;/b&gt;" in response.text
+        assert "<b>x</b>" not in response.text
+    
+    def test_render_fills_fields_in_one_pass(self):
+        # Arrange
+        from transbank_oneclick_api.api.v1.endpoints import callbacks
+
+        # Act
+        response = callbacks._render(
+            callbacks._REJECTED_PAGE,
+            error_message="$token_prefix",
+            token_prefix=None
+        )
+
+        # Assert
+        assert b"<strong>Error:</strong> $token_prefix</p>" in response.body
+        assert b"<strong>Token:</strong> ...</p>" in response.body
+
+    @pytest.mark.asyncio
+    async def test_inscription_result_coalesces_duplicate_tokens(self):
+        # Arrange
+        from transbank_oneclick_api.api.v1.endpoints import callbacks
+        
+        async def slow_finish(request):
+            await asyncio.sleep(0)
+            raise Exception("Connection error")
+        
+        service = Mock(finish_inscription=AsyncMock(side_effect=slow_finish))
+        
+        # Act
+        responses = await asyncio.gather(*(
+            callbacks.inscription_result_callback(TBK_TOKEN="dup_token", transbank_service=service)
+            for _ in range(3)
+        ))
+        
+        # Assert
+        assert service.finish_inscription.await_count == 1
+        assert all(b"Error del Sistema" in r.body for r in responses)
+        assert callbacks._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_inscription_result_shared_call_ends_with_its_owner(self):
+        # Arrange
+        from transbank_oneclick_api.api.v1.endpoints import callbacks
+
+        unwound = asyncio.Event()
+
+        async def hanging_finish(request):
+            try:
+                await asyncio.Event().wait()
+            finally:
+                unwound.set()
+
+        owner_service = Mock(finish_inscription=AsyncMock(side_effect=hanging_finish))
+        waiter_service = Mock(finish_inscription=AsyncMock(side_effect=Exception("Connection error")))
+
+        # Act
+        owner = asyncio.ensure_future(callbacks.inscription_result_callback(
+            TBK_TOKEN="owned_token", transbank_service=owner_service
+        ))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(callbacks.inscription_result_callback(
+            TBK_TOKEN="owned_token", transbank_service=waiter_service
+        ))
+        await asyncio.sleep(0)
+        owner.cancel()
+        response = await waiter
+
+        # Assert
+        assert owner.cancelled()
+        assert unwound.is_set()
+        assert waiter_service.finish_inscription.await_count == 1
+        assert b"Error del Sistema" in response.body
+        assert callbacks._inflight == {}
+
+    def test_inscription_status_is_cached(self, client, monkeypatch):
+        # Arrange
+        from transbank_oneclick_api.api.v1.endpoints import callbacks
+
+        monkeypatch.setattr(callbacks, "_status_cache", {"expires_at": 0.0, "body": None})
+        monkeypatch.setattr(callbacks, "monotonic", lambda: 100.0)
+        
+        # Act
+        first = client.get("/api/v1/callbacks/inscription/status")
+        second = client.get("/api/v1/callbacks/inscription/status")
+        
+        # Assert
+        assert first.status_code == 200
+        assert first.json()["status"] == "active"
+        assert second.content == first.content
+
+    def test_inscription_status_rebuilt_after_ttl(self, client, monkeypatch):
+        # Arrange
+        from datetime import datetime, timezone
+        from transbank_oneclick_api.api.v1.endpoints import callbacks
+
+        stamps = iter([
+            datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+            datetime(2026, 1, 1, 12, 0, 2, tzinfo=timezone.utc)
+        ])
+        clock = {"now": 100.0}
+        monkeypatch.setattr(callbacks, "_status_cache", {"expires_at": 0.0, "body": None})
+        monkeypatch.setattr(callbacks, "monotonic", lambda: clock["now"])
+        monkeypatch.setattr(callbacks, "datetime", Mock(now=lambda tz: next(stamps)))
+        
+        # Act
+        first = client.get("/api/v1/callbacks/inscription/status")
+        clock["now"] += callbacks._STATUS_TTL_SECONDS
+        second = client.get("/api/v1/callbacks/inscription/status")
+        
+        # Assert
+        assert first.json()["timestamp"] == "2026-01-01T12:00:00+00:00"
+        assert second.json()["timestamp"] == "2026-01-01T12:00:02+00:00"
+
+
 class TestHealthCheck:
     
     def test_root_endpoint(self, client):
@@ -7,6 +7,20 @@ from transbank_oneclick_api.domain.entities.inscription import (
 )
 
 
+class TestInscriptionStatus:
+    """Tests for InscriptionStatus conversion from string codes."""
+
+    def test_from_wire_round_trip(self):
+        """Test every status converts back from its string code."""
+        for status in InscriptionStatus:
+            assert InscriptionStatus.from_wire(status.value) is status
+
+    def test_unknown_code_raises_error(self):
+        """Test that an unknown string code raises error."""
+        with pytest.raises(ValueError, match="is not a valid InscriptionStatus"):
+            InscriptionStatus.from_wire("ACTIVE")
+
+
 class TestCardDetails:
     """Tests for CardDetails value object."""
 
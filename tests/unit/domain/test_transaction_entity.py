@@ -38,6 +38,38 @@ class TestAmount:
         amount = Amount(value=2500)
         assert str(amount) == "$25.00"
 
+    def test_amount_is_immutable_value(self):
+        """Test that equal amounts hash alike and cannot be modified."""
+        amount = Amount(value=1000)
+
+        assert {amount, Amount(value=1000)} == {amount}
+        with pytest.raises(AttributeError):
+            amount.value = 2000
+
+
+class TestWireCodes:
+    """Tests for enum conversion to and from Transbank string codes."""
+
+    def test_transaction_status_round_trip(self):
+        """Test every status converts to its string code and back."""
+        for status in TransactionStatus:
+            assert status.to_wire() == status.name
+            assert TransactionStatus.from_wire(status.to_wire()) is status
+
+    def test_payment_type_uses_official_codes(self):
+        """Test payment types map to the official Transbank codes."""
+        assert PaymentType.VENTA_DEBITO.to_wire() == "VD"
+        assert PaymentType.VENTA_CUOTAS.to_wire() == "VN"
+        assert PaymentType.from_wire("VN") is PaymentType.VENTA_CREDITO
+        assert PaymentType.from_wire("SI") is PaymentType.VENTA_SIN_CVV_CUOTAS
+
+    def test_unknown_code_raises_error(self):
+        """Test that an unknown string code raises error."""
+        with pytest.raises(ValueError, match="is not a valid TransactionStatus"):
+            TransactionStatus.from_wire("REJECTED")
+        with pytest.raises(ValueError, match="is not a valid PaymentType"):
+            PaymentType.from_wire("XX")
+
 
 class TestTransactionDetail:
     """Tests for TransactionDetail entity."""
@@ -229,6 +261,27 @@ class TestTransactionEntity:
         with pytest.raises(ValueError, match="Detail already exists"):
             transaction.add_detail(detail)
 
+    def test_add_detail_with_same_buy_order_raises_error(self):
+        """Test that a detail repeating commerce code and buy order is a duplicate."""
+        transaction = TransactionEntity(
+            username="testuser",
+            buy_order="buy_order_123",
+            details=[TransactionDetail(
+                commerce_code="597055555532",
+                buy_order="detail_001",
+                amount=Amount(value=1000),
+                status=TransactionStatus.AUTHORIZED
+            )]
+        )
+
+        with pytest.raises(ValueError, match="Detail already exists"):
+            transaction.add_detail(TransactionDetail(
+                commerce_code="597055555532",
+                buy_order="detail_001",
+                amount=Amount(value=2000),
+                status=TransactionStatus.FAILED
+            ))
+
     def test_get_total_amount(self):
         """Test calculating total amount."""
         transaction = TransactionEntity(
@@ -256,6 +309,53 @@ class TestTransactionEntity:
         total = transaction.get_total_amount()
         assert total.value == 3000
 
+    def test_get_total_amount_includes_initial_details(self):
+        """Test total counts details given at construction and added later."""
+        transaction = TransactionEntity(
+            username="testuser",
+            buy_order="buy_order_123",
+            details=[TransactionDetail(
+                commerce_code="597055555532",
+                buy_order="detail_001",
+                amount=Amount(value=1000),
+                status=TransactionStatus.AUTHORIZED
+            )]
+        )
+
+        transaction.add_detail(TransactionDetail(
+            commerce_code="597055555533",
+            buy_order="detail_002",
+            amount=Amount(value=2500),
+            status=TransactionStatus.AUTHORIZED
+        ))
+
+        assert transaction.get_total_amount().value == 3500
+
+    def test_direct_details_mutation_is_not_tracked(self):
+        """Test only add_detail updates the running total and duplicate check."""
+        transaction = TransactionEntity(
+            username="testuser",
+            buy_order="buy_order_123"
+        )
+        transaction.add_detail(TransactionDetail(
+            commerce_code="597055555532",
+            buy_order="detail_001",
+            amount=Amount(value=1000),
+            status=TransactionStatus.AUTHORIZED
+        ))
+        bypassed = TransactionDetail(
+            commerce_code="597055555533",
+            buy_order="detail_002",
+            amount=Amount(value=2000),
+            status=TransactionStatus.AUTHORIZED
+        )
+
+        transaction.details.append(bypassed)
+
+        assert transaction.get_total_amount().value == 1000
+        transaction.add_detail(bypassed)
+        assert len(transaction.details) == 3
+
     def test_is_fully_authorized_returns_true_all_authorized(self):
         """Test is_fully_authorized returns True when all details authorized."""
         transaction = TransactionEntity(
@@ -385,6 +485,32 @@ class TestTransactionEntity:
         assert len(authorized) == 1
         assert authorized[0] == detail1
 
+    def test_count_authorized(self):
+        """Test counting authorized details without materializing them."""
+        transaction = TransactionEntity(
+            username="testuser",
+            buy_order="buy_order_123"
+        )
+
+        transaction.add_detail(TransactionDetail(
+            commerce_code="597055555532",
+            buy_order="detail_001",
+            amount=Amount(value=1000),
+            status=TransactionStatus.AUTHORIZED,
+            authorization_code="1213",
+            response_code=0
+        ))
+        transaction.add_detail(TransactionDetail(
+            commerce_code="597055555533",
+            buy_order="detail_002",
+            amount=Amount(value=2000),
+            status=TransactionStatus.FAILED,
+            response_code=1
+        ))
+
+        assert transaction.count_authorized() == 1
+        assert next(transaction.iter_authorized_details()).buy_order == "detail_001"
+
     def test_can_be_refunded(self):
         """Test can_be_refunded returns True when fully authorized."""
         transaction = TransactionEntity(
@@ -1,27 +1,37 @@
 import pytest
 from datetime import datetime
+from sqlalchemy import insert
 
 from transbank_oneclick_api.repositories.inscription_repository import InscriptionRepository
 from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
 
 
+_BASE = {
+    "username": "testuser",
+    "email": "test@example.com",
+    "tbk_user": "tbk_test_123",
+    "inscription_date": datetime(2024, 1, 1),
+    "is_active": True  # COMPLETED
+}
+
+
+def make_inscription(**overrides) -> dict:
+    """Build inscription data from the shared base, applying overrides"""
+    return {**_BASE, **overrides}
+
+
+@pytest.fixture
+def repo(db_session):
+    """InscriptionRepository bound to the test session"""
+    return InscriptionRepository(db_session)
+
+
 class TestInscriptionRepository:
     """Test suite for InscriptionRepository"""
 
-    def test_create_inscription(self, db_session):
+    def test_create_inscription(self, repo, db_session):
         """Test creating a new inscription"""
-        from datetime import datetime
-        repo = InscriptionRepository(db_session)
-
-        inscription_data = {
-            "username": "testuser",
-            "email": "test@example.com",
-            "tbk_user": "tbk_test_123",
-            "inscription_date": datetime.utcnow(),
-            "is_active": False  # PENDING
-        }
-
-        inscription = repo.create(inscription_data)
+        inscription = repo.create(make_inscription(is_active=False))  # PENDING
         db_session.flush()
 
         assert inscription.id is not None
@@ -31,20 +41,9 @@ class TestInscriptionRepository:
         assert inscription.is_active is False
         assert inscription.inscription_date is not None
 
-    def test_get_by_id(self, db_session):
+    def test_get_by_id(self, repo, db_session):
         """Test retrieving inscription by ID"""
-        from datetime import datetime
-        repo = InscriptionRepository(db_session)
-
-        inscription_data = {
-            "username": "testuser2",
-            "email": "test2@example.com",
-            "tbk_user": "tbk_test_456",
-            "inscription_date": datetime.utcnow(),
-            "is_active": True  # COMPLETED
-        }
-
-        created = repo.create(inscription_data)
+        created = repo.create(make_inscription(username="testuser2", tbk_user="tbk_test_456"))
         db_session.flush()
 
         retrieved = repo.get_by_id(created.id)
@@ -54,20 +53,13 @@ class TestInscriptionRepository:
         assert retrieved.username == "testuser2"
         assert retrieved.is_active is True
 
-    def test_get_by_username(self, db_session):
+    def test_get_by_username(self, repo, db_session):
         """Test retrieving inscription by username"""
-        from datetime import datetime
-        repo = InscriptionRepository(db_session)
-
-        inscription_data = {
-            "username": "testuser3",
-            "email": "test3@example.com",
-            "tbk_user": "tbk_test_789",
-            "inscription_date": datetime.utcnow(),
-            "is_active": True  # COMPLETED
-        }
-
-        repo.create(inscription_data)
+        repo.create(make_inscription(
+            username="testuser3",
+            email="test3@example.com",
+            tbk_user="tbk_test_789"
+        ))
         db_session.flush()
 
         inscription = repo.get_by_username("testuser3")
@@ -77,27 +69,15 @@ class TestInscriptionRepository:
         assert inscription.is_active is True
         assert inscription.email == "test3@example.com"
 
-    def test_get_by_username_not_found(self, db_session):
+    def test_get_by_username_not_found(self, repo):
         """Test retrieving non-existent username returns None"""
-        repo = InscriptionRepository(db_session)
-
         inscription = repo.get_by_username("nonexistent_user")
 
         assert inscription is None
 
-    def test_get_by_tbk_user(self, db_session):
+    def test_get_by_tbk_user(self, repo, db_session):
         """Test retrieving inscription by Transbank user token"""
-        repo = InscriptionRepository(db_session)
-
-        inscription_data = {
-            "username": "testuser4",
-            "email": "test4@example.com",
-            "tbk_user": "tbk_unique_token_123",
-            "inscription_date": datetime.utcnow(),
-            "is_active": True  # COMPLETED
-        }
-
-        repo.create(inscription_data)
+        repo.create(make_inscription(username="testuser4", tbk_user="tbk_unique_token_123"))
         db_session.flush()
 
         inscription = repo.get_by_tbk_user("tbk_unique_token_123")
@@ -106,63 +86,52 @@ class TestInscriptionRepository:
         assert inscription.tbk_user == "tbk_unique_token_123"
         assert inscription.username == "testuser4"
 
-    def test_get_by_tbk_user_not_found(self, db_session):
+    def test_get_by_tbk_user_not_found(self, repo):
         """Test retrieving non-existent tbk_user returns None"""
-        repo = InscriptionRepository(db_session)
-
         inscription = repo.get_by_tbk_user("nonexistent_token")
 
         assert inscription is None
 
-    def test_get_active_by_username(self, db_session):
+    @pytest.mark.parametrize("is_active", [False, True])  # PENDING, COMPLETED
+    def test_get_active_by_username(self, repo, db_session, is_active):
         """Test retrieving only COMPLETED (active) inscriptions"""
-        repo = InscriptionRepository(db_session)
-
-        # Create PENDING inscription
-        pending_data = {
-            "username": "testuser5",
-            "email": "test5@example.com",
-            "tbk_user": "tbk_pending_123",
-            "inscription_date": datetime.utcnow(),
-            "is_active": False  # PENDING
-        }
-        repo.create(pending_data)
-
-        # Create COMPLETED inscription
-        completed_data = {
-            "username": "testuser6",
-            "email": "test6@example.com",
-            "tbk_user": "tbk_completed_456",
-            "inscription_date": datetime.utcnow(),
-            "is_active": True  # COMPLETED
-        }
-        repo.create(completed_data)
+        repo.create(make_inscription(username="testuser5", is_active=is_active))
         db_session.flush()
 
-        # Should return None for PENDING
-        pending_inscription = repo.get_active_by_username("testuser5")
-        assert pending_inscription is None
+        inscription = repo.get_active_by_username("testuser5")
+
+        if is_active:
+            assert inscription is not None
+            assert inscription.username == "testuser5"
+            assert inscription.is_active is True
+        else:
+            assert inscription is None
+
+    @pytest.mark.parametrize("is_active,expected", [
+        (None, {"tbk_card_active", "tbk_card_inactive"}),
+        (True, {"tbk_card_active"}),
+        (False, {"tbk_card_inactive"})
+    ])
+    def test_list_cards_by_username(self, repo, db_session, is_active, expected):
+        """Test listing card columns filtered by active status"""
+        db_session.execute(insert(OneclickInscription), [
+            make_inscription(username="testuser_cards", tbk_user="tbk_card_active", card_type="VISA"),
+            make_inscription(username="testuser_cards", tbk_user="tbk_card_inactive", is_active=False)
+        ])
+        db_session.flush()
 
-        # Should return inscription for COMPLETED
-        completed_inscription = repo.get_active_by_username("testuser6")
-        assert completed_inscription is not None
-        assert completed_inscription.username == "testuser6"
-        assert completed_inscription.is_active is True
+        rows = repo.list_cards_by_username("testuser_cards", is_active)
 
-    def test_update_inscription(self, db_session):
-        """Test updating an inscription"""
-        repo = InscriptionRepository(db_session)
+        assert {row.tbk_user for row in rows} == expected
+        assert all(not isinstance(row, OneclickInscription) for row in rows)
 
-        inscription_data = {
-            "username": "testuser7",
-            "email": "test7@example.com",
-            "tbk_user": "tbk_initial_token",
-            "inscription_date": datetime.utcnow(),
-            "is_active": False  # PENDING
-        }
-
-        created = repo.create(inscription_data)
-        db_session.flush()
+    def test_update_inscription(self, repo, db_session):
+        """Test updating an inscription"""
+        created = repo.create(make_inscription(
+            username="testuser7",
+            tbk_user="tbk_initial_token",
+            is_active=False  # PENDING
+        ))
 
         # Update status and tbk_user
         updated = repo.update(created.id, {
@@ -180,20 +149,9 @@ class TestInscriptionRepository:
         assert updated.card_type == "VISA"
         assert updated.card_number_masked == "****1234"
 
-    def test_delete_inscription(self, db_session):
+    def test_delete_inscription(self, repo, db_session):
         """Test deleting an inscription"""
-        repo = InscriptionRepository(db_session)
-
-        inscription_data = {
-            "username": "testuser8",
-            "email": "test8@example.com",
-            "tbk_user": "tbk_delete_test",
-            "inscription_date": datetime.utcnow(),
-            "is_active": True  # COMPLETED
-        }
-
-        created = repo.create(inscription_data)
-        db_session.flush()
+        created = repo.create(make_inscription(username="testuser8", tbk_user="tbk_delete_test"))
 
         # Delete inscription
         result = repo.delete(created.id)
@@ -202,32 +160,29 @@ class TestInscriptionRepository:
         assert result is True
 
         # Verify deletion
-        deleted = repo.get_by_id(created.id)
-        assert deleted is None
+        db_session.expire_all()
+        assert db_session.get(OneclickInscription, created.id) is None
 
-    def test_delete_nonexistent_inscription(self, db_session):
+    def test_delete_nonexistent_inscription(self, repo):
         """Test deleting non-existent inscription returns False"""
-        repo = InscriptionRepository(db_session)
-
         result = repo.delete(99999)
 
         assert result is False
 
-    def test_get_all_inscriptions(self, db_session):
+    def test_get_all_inscriptions(self, repo, db_session):
         """Test retrieving all inscriptions with pagination"""
-        repo = InscriptionRepository(db_session)
-
         # Create multiple inscriptions
-        for i in range(5):
-            inscription_data = {
-                "username": f"testuser_all_{i}",
-                "email": f"test{i}@example.com",
-                "tbk_user": f"tbk_token_{i}",
-                "inscription_date": datetime.utcnow(),
-                "is_active": True  # COMPLETED
-            }
-            repo.create(inscription_data)
-
+        now = datetime.utcnow()
+        rows = [
+            make_inscription(
+                username=f"testuser_all_{i}",
+                email=f"test{i}@example.com",
+                tbk_user=f"tbk_token_{i}",
+                inscription_date=now
+            )
+            for i in range(5)
+        ]
+        db_session.execute(insert(OneclickInscription), rows)
         db_session.flush()
 
         # Get all inscriptions
@@ -236,21 +191,20 @@ class TestInscriptionRepository:
         assert len(inscriptions) >= 5
         assert all(isinstance(i, OneclickInscription) for i in inscriptions)
 
-    def test_get_all_with_pagination(self, db_session):
+    def test_get_all_with_pagination(self, repo, db_session):
         """Test pagination of inscriptions"""
-        repo = InscriptionRepository(db_session)
-
         # Create 10 inscriptions
-        for i in range(10):
-            inscription_data = {
-                "username": f"testuser_paginate_{i}",
-                "email": f"paginate{i}@example.com",
-                "tbk_user": f"tbk_paginate_{i}",
-                "inscription_date": datetime.utcnow(),
-                "is_active": True  # COMPLETED
-            }
-            repo.create(inscription_data)
-
+        now = datetime.utcnow()
+        rows = [
+            make_inscription(
+                username=f"testuser_paginate_{i}",
+                email=f"paginate{i}@example.com",
+                tbk_user=f"tbk_paginate_{i}",
+                inscription_date=now
+            )
+            for i in range(10)
+        ]
+        db_session.execute(insert(OneclickInscription), rows)
         db_session.flush()
 
         # Get first page (5 items)
@@ -0,0 +1,237 @@
+import io
+import logging
+import queue
+import sys
+
+import orjson
+import pytest
+import structlog
+
+from transbank_oneclick_api.core import logging_config
+from transbank_oneclick_api.core.logging_config import StructuredFormatter, request_context_var
+
+
+def make_record(msg="Processing request", args=(), level=logging.INFO, exc_info=None, **extra):
+    """Build a LogRecord with optional extra attributes"""
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def capture_stdout(monkeypatch):
+    """Replace stdout with a buffered stream; the returned BytesIO only sees flushed bytes"""
+    # Patched inside the test body: pytest swaps stdout back after fixture setup
+    raw = io.BytesIO()
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=65536)))
+    return raw
+
+
+@pytest.fixture
+def json_logging(monkeypatch):
+    """Start JSON logging on a captured stdout; restores structlog and the root logger"""
+    saved_config = structlog.get_config()
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    listeners = []
+
+    def start(log_level="INFO"):
+        raw = capture_stdout(monkeypatch)
+        listener = logging_config.setup_logging(log_level=log_level, json_logs=True)
+        listeners.append(listener)
+        return listener, raw
+
+    yield start
+
+    for listener in listeners:
+        if listener._thread is not None:
+            listener.stop()
+    structlog.configure(**saved_config)
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+@pytest.fixture
+def formatter():
+    """StructuredFormatter with a fresh timestamp cache"""
+    logging_config._ts_cache = (0, b'')
+    return StructuredFormatter()
+
+
+class TestStructuredFormatter:
+    """Test suite for StructuredFormatter"""
+
+    def test_format_plain_record(self, formatter):
+        """Test a record without extras renders every base field"""
+        entry = orjson.loads(formatter.format(make_record('user "%s"', ("ana",))))
+
+        assert list(entry) == [
+            "@timestamp", "level", "artifact", "version",
+            "correlation_id", "endpoint", "method", "message"
+        ]
+        assert entry["level"] == "INFO"
+        assert entry["artifact"] == logging_config._ARTIFACT
+        assert entry["version"] == logging_config._VERSION
+        assert entry["correlation_id"] is None
+        assert entry["message"] == 'user "ana"'
+
+    def test_format_reads_request_context(self, formatter):
+        """Test correlation id, endpoint and method come from the request context"""
+        token = request_context_var.set(("cid-123", "/api/v1/inscriptions", "POST"))
+        try:
+            entry = orjson.loads(formatter.format(make_record()))
+        finally:
+            request_context_var.reset(token)
+
+        assert entry["correlation_id"] == "cid-123"
+        assert entry["endpoint"] == "/api/v1/inscriptions"
+        assert entry["method"] == "POST"
+
+    def test_format_with_context(self, formatter):
+        """Test context is nested as an object, including non-string keys"""
+        entry = orjson.loads(formatter.format(make_record(context={"amount": 1000, 1: "one"})))
+
+        assert entry["context"] == {"amount": 1000, "1": "one"}
+        assert "error" not in entry
+        assert "traceback" not in entry
+
+    def test_format_with_error_and_exc_info(self, formatter):
+        """Test error and traceback are appended after the base fields"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+
+        entry = orjson.loads(formatter.format(make_record(
+            level=logging.ERROR,
+            exc_info=exc_info,
+            error={"type": "ValueError", "message": "boom"}
+        )))
+
+        assert entry["level"] == "ERROR"
+        assert entry["error"] == {"type": "ValueError", "message": "boom"}
+        assert entry["traceback"].startswith("Traceback (most recent call last):")
+        assert entry["traceback"].endswith("ValueError: boom")
+
+    def test_timestamp_rolls_over_to_next_second(self, formatter, monkeypatch):
+        """Test the cached second prefix is rebuilt when the second changes"""
+        # Records are built first: LogRecord reads the clock too
+        records = [make_record() for _ in range(3)]
+        clock = iter([1700000000_250000000, 1700000000_500000000, 1700000001_000125000])
+        monkeypatch.setattr(logging_config.time, "time_ns", lambda: next(clock))
+
+        stamps = [orjson.loads(formatter.format(record))["@timestamp"] for record in records]
+
+        assert stamps == [
+            "2023-11-14T22:13:20.250000Z",
+            "2023-11-14T22:13:20.500000Z",
+            "2023-11-14T22:13:21.000125Z"
+        ]
+
+
+class TestStdoutBytesHandler:
+    """Test suite for the JSON-mode stdout handler"""
+
+    def test_info_is_flushed_once_queue_is_idle(self, monkeypatch):
+        """Test an info line reaches the stream when no more records are queued"""
+        stdout_raw = capture_stdout(monkeypatch)
+        log_queue = queue.SimpleQueue()
+        handler = logging_config._StdoutBytesHandler(log_queue)
+
+        handler.handle((b'{"event":"idle"}', False))
+
+        assert stdout_raw.getvalue() == b'{"event":"idle"}\n'
+
+    def test_error_is_flushed_while_queue_has_records(self, monkeypatch):
+        """Test an error line is flushed even with more records queued"""
+        stdout_raw = capture_stdout(monkeypatch)
+        log_queue = queue.SimpleQueue()
+        handler = logging_config._StdoutBytesHandler(log_queue)
+        log_queue.put((b'{"event":"next"}', False))
+
+        handler.handle((b'{"event":"boom"}', True))
+
+        assert stdout_raw.getvalue() == b'{"event":"boom"}\n'
+
+    def test_info_is_batched_while_queue_has_records(self, monkeypatch):
+        """Test info lines stay buffered while the queue still holds records"""
+        stdout_raw = capture_stdout(monkeypatch)
+        log_queue = queue.SimpleQueue()
+        handler = logging_config._StdoutBytesHandler(log_queue)
+        log_queue.put((b'{"event":"second"}', False))
+
+        handler.handle((b'{"event":"first"}', False))
+        assert stdout_raw.getvalue() == b''
+
+        handler.handle(log_queue.get())
+        assert stdout_raw.getvalue() == b'{"event":"first"}\n{"event":"second"}\n'
+
+
+class TestJsonLogging:
+    """Test suite for setup_logging(json_logs=True)"""
+
+    def test_queue_logger_marks_errors_for_flush(self):
+        """Test structlog errors are queued with the flush flag and info without it"""
+        log_queue = queue.SimpleQueue()
+        queue_logger = logging_config._QueueBytesLogger(log_queue)
+
+        queue_logger.info(b"a")
+        queue_logger.error(b"b")
+
+        assert log_queue.get_nowait() == (b"a", False)
+        assert log_queue.get_nowait() == (b"b", True)
+
+    def test_one_json_line_per_event(self, json_logging):
+        """Test every structlog event is written as one orjson line"""
+        listener, raw = json_logging()
+        log = structlog.get_logger()
+
+        log.info("payment_authorized", amount=1000)
+        log.warning("payment_slow", elapsed_ms=812)
+        listener.stop()
+
+        entries = [orjson.loads(line) for line in raw.getvalue().splitlines()]
+        assert [(e["event"], e["level"]) for e in entries] == [
+            ("payment_authorized", "info"),
+            ("payment_slow", "warning")
+        ]
+        assert entries[0]["amount"] == 1000
+        assert "timestamp" in entries[0]
+
+    def test_debug_dropped_below_level(self, json_logging):
+        """Test debug events are not written when the level is INFO"""
+        listener, raw = json_logging(log_level="INFO")
+        log = structlog.get_logger()
+
+        log.debug("hidden")
+        log.info("shown")
+        listener.stop()
+
+        events = [orjson.loads(line)["event"] for line in raw.getvalue().splitlines()]
+        assert events == ["shown"]
+
+    def test_stop_drains_queue(self, json_logging):
+        """Test stop writes and flushes every queued event"""
+        listener, raw = json_logging()
+        log = structlog.get_logger()
+
+        for i in range(500):
+            log.info("event", i=i)
+        listener.stop()
+
+        entries = [orjson.loads(line) for line in raw.getvalue().splitlines()]
+        assert [e["i"] for e in entries] == list(range(500))
+
+    def test_stdlib_records_rendered_as_json(self, json_logging):
+        """Test stdlib loggers go through the same listener as JSON"""
+        listener, raw = json_logging()
+
+        logging.getLogger("sqlalchemy.engine").warning("slow query %s", "q1")
+        logging.getLogger("uvicorn.error").debug("hidden")
+        listener.stop()
+
+        entries = [orjson.loads(line) for line in raw.getvalue().splitlines()]
+        assert len(entries) == 1
+        assert entries[0]["level"] == "WARNING"
+        assert entries[0]["message"] == "slow query q1"
+        assert entries[0]["artifact"] == logging_config._ARTIFACT
@@ -0,0 +1,30 @@
+import pytest
+
+from transbank_oneclick_api.core.response_codes import ResponseCode, ResponseCodes
+
+
+REGISTERED = [
+    (name, value)
+    for name, value in vars(ResponseCodes).items()
+    if isinstance(value, ResponseCode)
+]
+
+
+class TestResponseCodes:
+    """Test suite for ResponseCodes lookup"""
+
+    @pytest.mark.parametrize("name,response_code", REGISTERED, ids=[name for name, _ in REGISTERED])
+    def test_by_code_round_trip(self, name, response_code):
+        """Test every registered response code is found by its string code"""
+        assert ResponseCodes.by_code(response_code.code) is getattr(ResponseCodes, name)
+
+    def test_codes_are_unique(self):
+        """Test no two response codes share a string code"""
+        codes = [response_code.code for _, response_code in REGISTERED]
+
+        assert len(codes) == len(set(codes))
+
+    def test_by_code_unknown_raises_key_error(self):
+        """Test looking up an unregistered code raises KeyError"""
+        with pytest.raises(KeyError):
+            ResponseCodes.by_code("XXX_999")
@@ -1,29 +1,72 @@
 import pytest
-from datetime import datetime
+import uuid
+from itertools import count
+from operator import attrgetter
+from datetime import datetime, timedelta
+from sqlalchemy import event, func, insert, select
 
 from transbank_oneclick_api.repositories.transaction_repository import TransactionRepository
 from transbank_oneclick_api.models.oneclick_transaction import OneclickTransaction, OneclickTransactionDetail
 
 
+def pluck_ids(rows) -> set:
+    """Collect the ids of ORM rows into a set"""
+    return set(map(attrgetter("id"), rows))
+
+
+@pytest.fixture
+def make_tx_data():
+    """Factory for transaction data with fresh ids on every call"""
+    base = {
+        "username": "testuser",
+        "status": "AUTHORIZED",
+        "total_amount": 10000,
+        "transaction_date": datetime.utcnow()
+    }
+
+    # Time-ordered ids append to the right edge of the primary key B-tree
+    # instead of landing on random pages like uuid4 does
+    stamp = base["transaction_date"].strftime("%Y%m%d%H%M%S%f")
+    seq = count()
+
+    def _make(**overrides) -> dict:
+        data = base.copy()
+        data["id"] = f"{stamp}-{next(seq):06d}"
+        data["inscription_id"] = str(uuid.uuid4())
+        data.update(overrides)
+        return data
+
+    return _make
+
+
+@pytest.fixture
+def repo(db_session):
+    """TransactionRepository bound to the test session"""
+    return TransactionRepository(db_session)
+
+
+@pytest.fixture
+def no_lazy_load(db_session):
+    """Fail any test that lazy loads a relationship (N+1 guard)"""
+    def reject_lazy_load(orm_execute_state):
+        if orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+            raise AssertionError(f"Unexpected lazy load: {orm_execute_state.statement}")
+
+    event.listen(db_session, "do_orm_execute", reject_lazy_load)
+    yield
+    event.remove(db_session, "do_orm_execute", reject_lazy_load)
+
+
 class TestTransactionRepository:
     """Test suite for TransactionRepository"""
 
-    def test_create_transaction(self, db_session):
+    def test_create_transaction(self, repo, db_session, make_tx_data):
         """Test creating a basic transaction"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_data = {
-            "id": str(uuid.uuid4()),
-            "username": "testuser",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_123",
-            "card_number_masked": "****1234",
-            "accounting_date": "2025-01-01",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 10000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            parent_buy_order="buy_order_123",
+            card_number_masked="****1234",
+            accounting_date="2025-01-01"
+        )
 
         transaction = repo.create(transaction_data)
         db_session.flush()
@@ -33,69 +76,34 @@ class TestTransactionRepository:
         assert transaction.parent_buy_order == "buy_order_123"
         assert transaction.card_number_masked == "****1234"
 
-    def test_create_with_details(self, db_session):
+    def test_create_with_details(self, repo, make_tx_data, details_factory):
         """Test creating transaction with details in a single operation"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_data = {
-            "id": str(uuid.uuid4()),
-            "username": "testuser2",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_456",
-            "card_number_masked": "****5678",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 35000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            username="testuser2",
+            parent_buy_order="buy_order_456",
+            card_number_masked="****5678",
+            total_amount=30000
+        )
 
-        details_data = [
-            {
-                "buy_order": "detail_001",
-                "commerce_code": "597055555532",
-                "amount": 10000,
-                "status": "AUTHORIZED",
-                "authorization_code": "1213",
-                "payment_type_code": "VN",
-                "response_code": 0,
-                "installments_number": 1
-            },
-            {
-                "buy_order": "detail_002",
-                "commerce_code": "597055555533",
-                "amount": 25000,
-                "status": "AUTHORIZED",
-                "authorization_code": "1214",
-                "payment_type_code": "VN",
-                "response_code": 0,
-                "installments_number": 3
-            }
-        ]
+        details_data = details_factory(2)
+        details_data[1]["installments_number"] = 3
 
         transaction = repo.create_with_details(transaction_data, details_data)
-        db_session.flush()
 
         assert transaction.id == transaction_data["id"]
         assert len(transaction.details) == 2
         assert transaction.details[0].amount == 10000
         assert transaction.details[0].commerce_code == "597055555532"
-        assert transaction.details[1].amount == 25000
+        assert transaction.details[1].amount == 20000
         assert transaction.details[1].installments_number == 3
 
-    def test_create_with_details_empty_list(self, db_session):
+    def test_create_with_details_empty_list(self, repo, db_session, make_tx_data):
         """Test creating transaction with empty details list"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_data = {
-            "id": str(uuid.uuid4()),
-            "username": "testuser3",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_empty",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 0,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            username="testuser3",
+            parent_buy_order="buy_order_empty",
+            total_amount=0
+        )
 
         transaction = repo.create_with_details(transaction_data, [])
         db_session.flush()
@@ -103,21 +111,10 @@ class TestTransactionRepository:
         assert transaction.id == transaction_data["id"]
         assert len(transaction.details) == 0
 
-    def test_get_by_id(self, db_session):
+    def test_get_by_id(self, repo, db_session, make_tx_data):
         """Test retrieving transaction by ID"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_id = str(uuid.uuid4())
-        transaction_data = {
-            "id": transaction_id,
-            "username": "testuser4",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_get",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 10000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(username="testuser4", parent_buy_order="buy_order_get")
+        transaction_id = transaction_data["id"]
 
         created = repo.create(transaction_data)
         db_session.flush()
@@ -128,42 +125,28 @@ class TestTransactionRepository:
         assert retrieved.id == transaction_id
         assert retrieved.username == "testuser4"
 
-    def test_get_by_id_not_found(self, db_session):
-        """Test retrieving non-existent transaction returns None"""
-        repo = TransactionRepository(db_session)
+    @pytest.mark.parametrize("method,expected", [
+        ("get_by_id", None),
+        ("get_by_buy_order", None),
+        ("delete", False)
+    ])
+    def test_missing_transaction(self, repo, method, expected):
+        """Test lookups and deletes of a non-existent transaction"""
+        result = getattr(repo, method)("nonexistent")
 
-        transaction = repo.get_by_id("nonexistent_order")
+        assert result is expected
 
-        assert transaction is None
-
-    def test_get_by_id_with_details(self, db_session):
+    @pytest.mark.usefixtures("no_lazy_load")
+    def test_get_by_id_with_details(self, repo, db_session, make_tx_data, details_factory):
         """Test retrieving transaction with details eagerly loaded"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_id = str(uuid.uuid4())
-        transaction_data = {
-            "id": transaction_id,
-            "username": "testuser5",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_eager",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 15000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            username="testuser5",
+            parent_buy_order="buy_order_eager",
+            total_amount=15000
+        )
+        transaction_id = transaction_data["id"]
 
-        details_data = [
-            {
-                "buy_order": "detail_eager_1",
-                "commerce_code": "597055555534",
-                "amount": 15000,
-                "status": "AUTHORIZED",
-                "authorization_code": "1215",
-                "payment_type_code": "VN",
-                "response_code": 0,
-                "installments_number": 1
-            }
-        ]
+        details_data = details_factory(1, amount=15000)
 
         created = repo.create_with_details(transaction_data, details_data)
         db_session.flush()
@@ -175,24 +158,15 @@ class TestTransactionRepository:
         assert len(transaction.details) == 1
         assert transaction.details[0].amount == 15000
 
-    def test_get_by_username(self, db_session):
+    @pytest.mark.usefixtures("no_lazy_load")
+    def test_get_by_username(self, repo, db_session, make_tx_data):
         """Test retrieving transactions by username"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
         # Create multiple transactions for same user
-        for i in range(3):
-            transaction_data = {
-                "id": str(uuid.uuid4()),
-                "username": "testuser_multi",
-                "inscription_id": str(uuid.uuid4()),
-                "parent_buy_order": f"buy_order_user_{i}",
-                "transaction_date": datetime.utcnow(),
-                "total_amount": 10000,
-                "status": "AUTHORIZED"
-            }
-            repo.create(transaction_data)
-
+        rows = [
+            make_tx_data(username="testuser_multi", parent_buy_order=f"buy_order_user_{i}")
+            for i in range(3)
+        ]
+        db_session.execute(insert(OneclickTransaction), rows)
         db_session.flush()
 
         transactions = repo.get_by_username("testuser_multi")
@@ -201,24 +175,29 @@ class TestTransactionRepository:
         assert all(t.username == "testuser_multi" for t in transactions)
         assert all(isinstance(t, OneclickTransaction) for t in transactions)
 
-    def test_get_by_username_with_pagination(self, db_session):
-        """Test retrieving transactions with pagination"""
-        import uuid
-        repo = TransactionRepository(db_session)
+    @pytest.mark.usefixtures("no_lazy_load")
+    def test_get_by_username_loads_details(self, repo, db_session, make_tx_data, details_factory):
+        """Test that details of every returned transaction are eagerly loaded"""
+        for i in range(3):
+            repo.create_with_details(
+                make_tx_data(username="testuser_eager", parent_buy_order=f"buy_order_eager_{i}"),
+                details_factory(1)
+            )
+        db_session.expire_all()
 
-        # Create 10 transactions
-        for i in range(10):
-            transaction_data = {
-                "id": str(uuid.uuid4()),
-                "username": "testuser_paginate",
-                "inscription_id": str(uuid.uuid4()),
-                "parent_buy_order": f"buy_order_paginate_{i}",
-                "transaction_date": datetime.utcnow(),
-                "total_amount": 10000,
-                "status": "AUTHORIZED"
-            }
-            repo.create(transaction_data)
+        transactions = repo.get_by_username("testuser_eager")
 
+        assert len(transactions) == 3
+        assert all(len(t.details) == 1 for t in transactions)
+
+    def test_get_by_username_with_pagination(self, repo, db_session, make_tx_data):
+        """Test retrieving transactions with pagination"""
+        # Create 10 transactions
+        rows = [
+            make_tx_data(username="testuser_paginate", parent_buy_order=f"buy_order_paginate_{i}")
+            for i in range(10)
+        ]
+        db_session.execute(insert(OneclickTransaction), rows)
         db_session.flush()
 
         # Test pagination
@@ -229,36 +208,22 @@ class TestTransactionRepository:
         assert len(page2) == 5
 
         # Verify different transactions
-        page1_ids = {t.id for t in page1}
-        page2_ids = {t.id for t in page2}
-        assert len(page1_ids & page2_ids) == 0  # No overlap
+        assert not (pluck_ids(page1) & pluck_ids(page2))  # No overlap
 
-    def test_get_by_username_empty_result(self, db_session):
+    def test_get_by_username_empty_result(self, repo):
         """Test retrieving transactions for user with no transactions"""
-        repo = TransactionRepository(db_session)
-
         transactions = repo.get_by_username("nonexistent_user")
 
         assert len(transactions) == 0
         assert transactions == []
 
-    def test_get_by_buy_order(self, db_session):
+    def test_get_by_buy_order(self, repo, db_session, make_tx_data):
         """Test retrieving transaction by buy_order"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_data = {
-            "id": str(uuid.uuid4()),
-            "username": "testuser6",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "unique_buy_order_789",
-            "card_number_masked": "****9999",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 10000,
-            "status": "AUTHORIZED"
-        }
-
-        repo.create(transaction_data)
+        repo.create(make_tx_data(
+            username="testuser6",
+            parent_buy_order="unique_buy_order_789",
+            card_number_masked="****9999"
+        ))
         db_session.flush()
 
         transaction = repo.get_by_buy_order("unique_buy_order_789")
@@ -268,33 +233,16 @@ class TestTransactionRepository:
         assert transaction.username == "testuser6"
         assert transaction.card_number_masked == "****9999"
 
-    def test_get_by_buy_order_not_found(self, db_session):
-        """Test retrieving non-existent buy_order returns None"""
-        repo = TransactionRepository(db_session)
-
-        transaction = repo.get_by_buy_order("nonexistent_buy_order")
-
-        assert transaction is None
-
-    def test_update_transaction(self, db_session):
+    def test_update_transaction(self, repo, db_session, make_tx_data):
         """Test updating a transaction"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_id = str(uuid.uuid4())
-        transaction_data = {
-            "id": transaction_id,
-            "username": "testuser7",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_update",
-            "card_number_masked": "****1111",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 10000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            username="testuser7",
+            parent_buy_order="buy_order_update",
+            card_number_masked="****1111"
+        )
+        transaction_id = transaction_data["id"]
 
         created = repo.create(transaction_data)
-        db_session.flush()
 
         # Update transaction
         updated = repo.update(transaction_id, {
@@ -307,24 +255,12 @@ class TestTransactionRepository:
         assert updated.card_number_masked == "****2222"
         assert updated.accounting_date == "2025-01-15"
 
-    def test_delete_transaction(self, db_session):
+    def test_delete_transaction(self, repo, db_session, make_tx_data):
         """Test deleting a transaction"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_id = str(uuid.uuid4())
-        transaction_data = {
-            "id": transaction_id,
-            "username": "testuser8",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_delete",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 10000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(username="testuser8", parent_buy_order="buy_order_delete")
+        transaction_id = transaction_data["id"]
 
         created = repo.create(transaction_data)
-        db_session.flush()
 
         # Delete transaction
         result = repo.delete(transaction_id)
@@ -333,122 +269,78 @@ class TestTransactionRepository:
         assert result is True
 
         # Verify deletion
-        deleted = repo.get_by_id(transaction_id)
-        assert deleted is None
-
-    def test_delete_nonexistent_transaction(self, db_session):
-        """Test deleting non-existent transaction returns False"""
-        repo = TransactionRepository(db_session)
-
-        result = repo.delete("nonexistent_transaction")
-
-        assert result is False
+        db_session.expire_all()
+        assert db_session.get(OneclickTransaction, transaction_id) is None
 
-    def test_transaction_detail_cascade(self, db_session):
+    @pytest.mark.usefixtures("no_lazy_load")
+    def test_transaction_detail_cascade(self, repo, db_session, make_tx_data, details_factory):
         """Test that transaction details are properly associated"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
-        transaction_id = str(uuid.uuid4())
-        transaction_data = {
-            "id": transaction_id,
-            "username": "testuser9",
-            "inscription_id": str(uuid.uuid4()),
-            "parent_buy_order": "buy_order_cascade",
-            "transaction_date": datetime.utcnow(),
-            "total_amount": 70000,
-            "status": "AUTHORIZED"
-        }
+        transaction_data = make_tx_data(
+            username="testuser9",
+            parent_buy_order="buy_order_cascade",
+            total_amount=30000
+        )
+        transaction_id = transaction_data["id"]
 
-        details_data = [
-            {
-                "buy_order": "detail_cascade_1",
-                "commerce_code": "597055555535",
-                "amount": 30000,
-                "status": "AUTHORIZED",
-                "authorization_code": "1216",
-                "payment_type_code": "VN",
-                "response_code": 0,
-                "installments_number": 6
-            },
-            {
-                "buy_order": "detail_cascade_2",
-                "commerce_code": "597055555536",
-                "amount": 40000,
-                "status": "REJECTED",
-                "authorization_code": None,
-                "payment_type_code": "VN",
-                "response_code": 1,
-                "installments_number": 1
-            }
-        ]
+        details_data = details_factory(2)
+        details_data[1].update(status="REJECTED", authorization_code=None, response_code=1)
 
         transaction = repo.create_with_details(transaction_data, details_data)
-        db_session.flush()
 
-        # Verify details are properly associated
+        # The returned object already holds its details collection
+        assert len(transaction.details) == 2
+        assert transaction.details[0].transaction_id == transaction_id
+        assert transaction.details[1].transaction_id == transaction_id
+        assert transaction.details[0].status == "AUTHORIZED"
+        assert transaction.details[1].status == "REJECTED"
+
+        # Verify persistence with a single eager-loading round trip
+        db_session.expire_all()
         retrieved = repo.get_by_id_with_details(transaction_id)
 
-        assert len(retrieved.details) == 2
-        assert retrieved.details[0].transaction_id == transaction_id
-        assert retrieved.details[1].transaction_id == transaction_id
-        assert retrieved.details[0].status == "AUTHORIZED"
-        assert retrieved.details[1].status == "REJECTED"
+        assert {d.buy_order: d.status for d in retrieved.details} == {
+            "d_0": "AUTHORIZED",
+            "d_1": "REJECTED"
+        }
 
-    def test_get_all_transactions(self, db_session):
+    def test_get_all_transactions(self, repo, db_session, make_tx_data):
         """Test retrieving all transactions"""
-        import uuid
-        repo = TransactionRepository(db_session)
-
         # Create multiple transactions
-        for i in range(5):
-            transaction_data = {
-                "id": str(uuid.uuid4()),
-                "username": f"testuser_all_{i}",
-                "inscription_id": str(uuid.uuid4()),
-                "parent_buy_order": f"buy_order_all_{i}",
-                "transaction_date": datetime.utcnow(),
-                "total_amount": 10000,
-                "status": "AUTHORIZED"
-            }
-            repo.create(transaction_data)
-
+        rows = [
+            make_tx_data(username=f"testuser_all_{i}", parent_buy_order=f"buy_order_all_{i}")
+            for i in range(5)
+        ]
+        db_session.execute(insert(OneclickTransaction), rows)
         db_session.flush()
 
-        transactions = repo.get_all(skip=0, limit=100)
+        total = db_session.execute(
+            select(func.count()).select_from(OneclickTransaction)
+        ).scalar()
+        assert total >= 5
 
-        assert len(transactions) >= 5
-        assert all(isinstance(t, OneclickTransaction) for t in transactions)
+        # Hydrate a single row to check the repository returns ORM models
+        transactions = repo.get_all(skip=0, limit=1)
+        assert len(transactions) == 1
+        assert isinstance(transactions[0], OneclickTransaction)
 
-    def test_transaction_ordering_by_created_at(self, db_session):
+    def test_transaction_ordering_by_created_at(self, repo, db_session, make_tx_data):
         """Test that transactions are ordered by created_at DESC"""
-        import uuid
-        import time
-        repo = TransactionRepository(db_session)
-
-        transaction_ids = []
-        # Create transactions with different timestamps
-        for i in range(3):
-            transaction_id = str(uuid.uuid4())
-            transaction_ids.append(transaction_id)
-            transaction_data = {
-                "id": transaction_id,
-                "username": "testuser_ordering",
-                "inscription_id": str(uuid.uuid4()),
-                "parent_buy_order": f"buy_order_time_{i}",
-                "transaction_date": datetime.utcnow(),
-                "total_amount": 10000,
-                "status": "AUTHORIZED"
-            }
-            repo.create(transaction_data)
-            db_session.flush()
-            time.sleep(0.01)  # Small delay to ensure different timestamps
+        # Create transactions with distinct, increasing timestamps
+        base = datetime.utcnow()
+        rows = [
+            make_tx_data(
+                username="testuser_ordering",
+                parent_buy_order=f"buy_order_time_{i}",
+                created_at=base + timedelta(milliseconds=i)
+            )
+            for i in range(3)
+        ]
+        transaction_ids = [row["id"] for row in rows]
+        # Insert out of order so neither insertion nor id order matches created_at DESC
+        db_session.execute(insert(OneclickTransaction), [rows[1], rows[0], rows[2]])
+        db_session.flush()
 
         transactions = repo.get_by_username("testuser_ordering", skip=0, limit=10)
 
-        # Verify we got all 3 transactions
-        assert len(transactions) == 3
-        # Verify all transaction IDs are present (order may vary in mock)
-        retrieved_ids = {t.id for t in transactions}
-        expected_ids = set(transaction_ids)
-        assert retrieved_ids == expected_ids
+        # Newest first, as returned by the repository's ORDER BY created_at DESC
+        assert [t.id for t in transactions] == transaction_ids[::-1]
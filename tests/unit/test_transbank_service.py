@@ -1,4 +1,6 @@
+import asyncio
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timezone
 from transbank_oneclick_api.services.transbank_service import TransbankService
@@ -9,14 +11,38 @@ from transbank_oneclick_api.schemas.oneclick_schemas import (
 )
 
 
+_MOCK_TX_DATE = datetime(2023, 3, 20, 10, 30, 0)
+_NOW = datetime.now(timezone.utc)
+_CONN_ERR = Exception("Connection error")
+
+START_REQUEST = InscriptionStartRequest(
+    username="testuser",
+    email="test@example.com",
+    response_url="https://example.com/callback"
+)
+
+FINISH_REQUEST = InscriptionFinishRequest(
+    token="test_token",
+    username="testuser"
+)
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """One event loop shared by every async test in this module"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
 class TestTransbankService:
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def db_session(self):
         """Mock database session"""
         return MagicMock()
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def transbank_service(self, db_session):
         service = TransbankService.__new__(TransbankService)
         service.db = db_session
@@ -26,21 +52,29 @@ class TestTransbankService:
         service.mall_transaction = MagicMock()
         return service
     
+    @pytest.fixture(autouse=True)
+    def reset_mocks(self, transbank_service):
+        """Clear calls, return values and side effects left by the previous test"""
+        yield
+        for mock in (
+            transbank_service.db,
+            transbank_service.inscription_repo,
+            transbank_service.transaction_repo,
+            transbank_service.mall_inscription,
+            transbank_service.mall_transaction
+        ):
+            mock.reset_mock(return_value=True, side_effect=True)
+    
     @pytest.mark.asyncio
     async def test_start_inscription_success(self, transbank_service):
         # Arrange
-        request = InscriptionStartRequest(
-            username="testuser",
-            email="test@example.com",
-            response_url="https://example.com/callback"
-        )
         transbank_service.mall_inscription.start.return_value = {
             "token": "test_token_123",
             "url_webpay": "https://webpay.transbank.cl/test"
         }
         
         # Act
-        result = await transbank_service.start_inscription(request)
+        result = await transbank_service.start_inscription(START_REQUEST)
         
         # Assert
         assert result.token == "test_token_123"
@@ -54,24 +88,15 @@ class TestTransbankService:
     @pytest.mark.asyncio
     async def test_start_inscription_error(self, transbank_service):
         # Arrange
-        request = InscriptionStartRequest(
-            username="testuser",
-            email="test@example.com",
-            response_url="https://example.com/callback"
-        )
-        transbank_service.mall_inscription.start.side_effect = Exception("Connection error")
+        transbank_service.mall_inscription.start.side_effect = _CONN_ERR
         
         # Act & Assert
         with pytest.raises(TransbankCommunicationException):
-            await transbank_service.start_inscription(request)
+            await transbank_service.start_inscription(START_REQUEST)
     
     @pytest.mark.asyncio
     async def test_finish_inscription_success(self, transbank_service):
         # Arrange
-        request = InscriptionFinishRequest(
-            token="test_token",
-            username="testuser"
-        )
         transbank_service.mall_inscription.finish.return_value = {
             "response_code": 0,
             "tbk_user": "user_token_123",
@@ -95,8 +120,8 @@ class TestTransbankService:
             status=InscriptionStatus.COMPLETED,
             card_details=CardDetails(card_type="VISA", card_number="XXXX-XXXX-XXXX-1234"),
             authorization_code="auth_123",
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            created_at=_NOW,
+            updated_at=_NOW
         )
         
         # Patch InscriptionEntity to return our mock entity
@@ -104,7 +129,7 @@ class TestTransbankService:
             transbank_service.inscription_repo.save_entity.return_value = mock_entity
             
             # Act
-            result = await transbank_service.finish_inscription(request)
+            result = await transbank_service.finish_inscription(FINISH_REQUEST)
             
             # Assert
             assert result.response_code == 0
@@ -115,30 +140,23 @@ class TestTransbankService:
     @pytest.mark.asyncio
     async def test_finish_inscription_rejected(self, transbank_service):
         # Arrange
-        request = InscriptionFinishRequest(
-            token="test_token",
-            username="testuser"
-        )
         transbank_service.mall_inscription.finish.return_value = {
             "response_code": -1
         }
         
         # Act & Assert
         with pytest.raises(TransactionRejectedException):
-            await transbank_service.finish_inscription(request)
+            await transbank_service.finish_inscription(FINISH_REQUEST)
     
     @pytest.mark.asyncio
     async def test_authorize_transaction_success(self, transbank_service):
         # Arrange
-        from datetime import datetime
-        mock_date = datetime(2023, 3, 20, 10, 30, 0)
-        
         transbank_service.mall_transaction.authorize.return_value = {
             "parent_buy_order": "parent_order_123",
             "session_id": "session_123",
             "card_detail": {"card_number": "XXXX-XXXX-XXXX-1234"},
             "accounting_date": "0320",
-            "transaction_date": mock_date,
+            "transaction_date": _MOCK_TX_DATE,
             "details": [
                 {
                     "amount": 10000,
@@ -161,8 +179,8 @@ class TestTransbankService:
             buy_order="parent_order_123",
             card_number="XXXX-XXXX-XXXX-1234",
             accounting_date="0320",
-            transaction_date=mock_date,
-            created_at=datetime.now(timezone.utc)
+            transaction_date=_MOCK_TX_DATE,
+            created_at=_NOW
         )
         detail = TransactionDetail(
             commerce_code="597055555542",
@@ -176,7 +194,7 @@ class TestTransbankService:
         )
         mock_entity.add_detail(detail)
         transbank_service.transaction_repo.find_by_buy_order_entity.return_value = None
-        transbank_service.inscription_repo.find_active_by_username_entity.return_value = MagicMock(tbk_user="user_token")
+        transbank_service.inscription_repo.find_active_by_username_entity.return_value = SimpleNamespace(tbk_user="user_token")
         transbank_service.transaction_repo.save_entity.return_value = mock_entity
         
         details = [{
@@ -202,45 +220,52 @@ class TestTransbankService:
     @pytest.mark.asyncio
     async def test_delete_inscription_success(self, transbank_service):
         # Arrange
-        from transbank_oneclick_api.domain.entities.inscription import InscriptionEntity, InscriptionStatus
-        from datetime import datetime, timezone
-        
-        mock_entity = InscriptionEntity(
+        from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
+
+        inscription = OneclickInscription(
             id="test_id",
             username="testuser",
             email="test@example.com",
             tbk_user="user_token",
-            url_webpay="https://webpay.test",  # Required field
-            status=InscriptionStatus.COMPLETED,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            is_active=True
         )
-        transbank_service.inscription_repo.find_active_by_username_entity.return_value = mock_entity
         transbank_service.mall_inscription.delete.return_value = None
         
         # Act
-        result = await transbank_service.delete_inscription(
-            tbk_user="user_token",
-            username="testuser"
-        )
+        result = await transbank_service.delete_inscription(inscription)
         
         # Assert
         assert result is True
         transbank_service.mall_inscription.delete.assert_called_once_with("user_token", "testuser")
-        transbank_service.inscription_repo.delete.assert_called_once_with("test_id")
+        transbank_service.inscription_repo.get_active_by_username.assert_not_called()
+        assert inscription.is_active is False
+        transbank_service.db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_inscription_transbank_error_keeps_row_active(self, transbank_service):
+        # Arrange
+        from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
+
+        inscription = OneclickInscription(username="testuser", tbk_user="user_token", is_active=True)
+        transbank_service.mall_inscription.delete.side_effect = _CONN_ERR
+
+        # Act & Assert
+        with pytest.raises(TransbankCommunicationException):
+            await transbank_service.delete_inscription(inscription)
+
+        assert inscription.is_active is True
+        transbank_service.db.commit.assert_not_called()
+        transbank_service.db.rollback.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_get_transaction_status_success(self, transbank_service):
         # Arrange
-        from datetime import datetime
-        mock_date = datetime(2023, 3, 20, 10, 30, 0)
-        
         transbank_service.mall_transaction.status.return_value = {
             "buy_order": "order_123",
             "session_id": "session_123",
             "card_detail": {"card_number": "XXXX-XXXX-XXXX-1234"},
             "accounting_date": "0320",
-            "transaction_date": mock_date,
+            "transaction_date": _MOCK_TX_DATE,
             "details": [
                 {
                     "amount": 10000,
@@ -1,12 +1,17 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from transbank_oneclick_api.database import get_db
+from transbank_oneclick_api.repositories.inscription_repository import InscriptionRepository
 from transbank_oneclick_api.services.transbank_service import TransbankService
 
 
-def get_transbank_service(db: Session = Depends(get_db)) -> TransbankService:
+def get_database_session(db: Session = Depends(get_db)) -> Session:
+    return db
+
+
+def get_transbank_service(db: Session = Depends(get_database_session)) -> TransbankService:
     return TransbankService(db=db)
 
 
-def get_database_session() -> Session:
-    return get_db()
\ No newline at end of file
+def get_inscription_repository(db: Session = Depends(get_database_session)) -> InscriptionRepository:
+    return InscriptionRepository(db=db)
@@ -1,15 +1,183 @@
+import asyncio
+import random
+import re
+from typing import Dict, Optional
+
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import HTMLResponse
-from datetime import datetime
+from fastapi.responses import HTMLResponse, Response
+from datetime import datetime, timezone
+from time import monotonic
+from html import escape
+import orjson
 import structlog
 
 from transbank_oneclick_api.schemas.oneclick_schemas import InscriptionFinishRequest
 from transbank_oneclick_api.services.transbank_service import TransbankService
 from transbank_oneclick_api.api.deps import get_transbank_service
 from transbank_oneclick_api.core.exceptions import TransactionRejectedException
+from transbank_oneclick_api.config import settings
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
+_log = logger.bind(endpoint="inscription_result")
+
+# Username recorded for inscriptions finished through this test callback;
+# InscriptionFinishResponse does not echo it back
+_CALLBACK_USERNAME = "test_username"
+
+# finish_inscription calls in flight, keyed by TBK_TOKEN
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Scaffolding shared by every callback page
+_PAGE_STYLE = """\
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            text-align: center;
+            padding: 50px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+            max-width: 500px;
+            margin: 0 auto;
+        }
+        .success { color: #28a745; }
+        .error { color: #dc3545; }
+        .card-info {
+            background: #f8f9fa;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .test-badge {
+            background: #007bff;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            font-size: 12px;
+            margin-bottom: 20px;
+            display: inline-block;
+        }
+    </style>
+"""
+
+_PAGE_CLOSE = """\
+        <p><em>Este es un endpoint de testing para callbacks de Transbank.</em></p>
+    </div>
+</body>
+</html>
+"""
+
+
+def _page(title: str, content: str) -> bytes:
+    """Wrap page-specific content in the shared scaffolding and encode it"""
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        f"    <title>{title} - Testing</title>\n"
+        '    <meta charset="UTF-8">\n'
+        + _PAGE_STYLE
+        + "</head>\n<body>\n"
+        '    <div class="container">\n'
+        '        <div class="test-badge">TEST ENDPOINT</div>\n'
+        + content
+        + _PAGE_CLOSE
+    ).encode("utf-8")
+
+
+# Pages carry card and token data, so they must never be cached
+_PAGE_HEADERS = {
+    "content-type": "text/html; charset=utf-8",
+    "cache-control": "no-store"
+}
+
+
+_FIELD_HOLE = re.compile(rb"\$(\w+)")
+
+
+def _render(page: bytes, **fields: Optional[str]) -> Response:
+    """Fill the $field holes of a pre-encoded page with escaped values"""
+    values = {
+        name.encode(): escape(value or "").encode("utf-8")
+        for name, value in fields.items()
+    }
+    # One pass, so a value containing "$name" is never substituted again
+    page = _FIELD_HOLE.sub(lambda m: values.get(m.group(1), m.group(0)), page)
+    # Passing every header up front skips Starlette's own header population
+    return Response(content=page, headers={**_PAGE_HEADERS, "content-length": str(len(page))})
+
+
+# Pages are encoded once at import; handlers only fill in the escaped values
+_SUCCESS_PAGE = _page("Inscripción Exitosa", """\
+        <h1 class="success">✅ Inscripción Exitosa</h1>
+        <p>Tu tarjeta ha sido registrada correctamente en nuestro sistema.</p>
+        <div class="card-info">
+            <p><strong>Usuario:</strong> $username</p>
+            <p><strong>Tipo de tarjeta:</strong> $card_type</p>
+            <p><strong>Número:</strong> $card_number</p>
+            <p><strong>Código de autorización:</strong> $authorization_code</p>
+            <p><strong>TBK User:</strong> $tbk_user_prefix...</p>
+        </div>
+        <p>Ya puedes cerrar esta ventana.</p>
+""")
+
+_REJECTED_PAGE = _page("Error en Inscripción", """\
+        <h1 class="error">❌ Error en Inscripción</h1>
+        <p>Hubo un problema al procesar el registro de tu tarjeta.</p>
+        <p><strong>Error:</strong> $error_message</p>
+        <p><strong>Token:</strong> $token_prefix...</p>
+        <p>Por favor, intenta nuevamente o contacta a soporte.</p>
+""")
+
+_ERROR_PAGE = _page("Error del Sistema", """\
+        <h1 class="error">❌ Error del Sistema</h1>
+        <p>Ocurrió un error inesperado al procesar tu solicitud.</p>
+        <p><strong>Token:</strong> $token_prefix...</p>
+        <p>Por favor, contacta a soporte técnico.</p>
+""")
+
+
+async def _finish_once(token: str, transbank_service: TransbankService):
+    """
+    Finish an inscription, sharing one upstream call between duplicate callbacks.
+
+    Transbank retries and double submits can deliver the same token
+    concurrently; later callers await the call already in flight instead of
+    confirming the token again.
+
+    The shared call runs on the owning request's service and session, so it
+    never outlives that request: if the owner is cancelled the call is
+    cancelled too and the remaining callers start over with their own.
+    """
+    while True:
+        future = _inflight.get(token)
+        if future is None or future.cancelled():
+            break
+        try:
+            # Shield so a disconnecting waiter does not cancel the shared call
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # This caller itself was cancelled
+
+    future = asyncio.ensure_future(transbank_service.finish_inscription(
+        InscriptionFinishRequest(token=token, username=_CALLBACK_USERNAME)
+    ))
+    _inflight[token] = future
+    future.add_done_callback(
+        lambda done: _inflight.pop(token) if _inflight.get(token) is done else None
+    )
+
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # Let the call unwind before this request's session is closed
+        future.cancel()
+        await asyncio.wait({future})
+        raise
 
 
 @router.get("/inscription/result", response_class=HTMLResponse)
@@ -27,206 +195,80 @@ async def inscription_result_callback(
 
     NO database operations - Service handles everything.
     """
+    token_head10 = TBK_TOKEN[:10]
+    token_head15 = TBK_TOKEN[:15]
+    # Head sampling: decide once so a request logs all or none of its info lines
+    sampled = random.random() < settings.CALLBACK_LOG_SAMPLE_RATE
+
     try:
-        logger.info("Processing inscription result from Transbank", token_prefix=TBK_TOKEN[:10])
+        if sampled:
+            _log.info("Processing inscription result from Transbank", token_prefix=token_head10)
 
-        inscriptionFinishRequest = InscriptionFinishRequest(token=TBK_TOKEN, username="test_username")
-        result = await transbank_service.finish_inscription(inscriptionFinishRequest)
+        result = await _finish_once(TBK_TOKEN, transbank_service)
+        tbk_user = result.tbk_user or ""
 
-        logger.info(
-            "Inscription completed successfully",
-            username=result.username,
-            tbk_user_prefix=result.tbk_user[:10] if result.tbk_user else "",
-            card_type=result.card_type,
-            card_number=result.card_number
-        )
+        if sampled:
+            _log.info(
+                "Inscription completed successfully",
+                username=_CALLBACK_USERNAME,
+                tbk_user_prefix=tbk_user[:10],
+                card_type=result.card_type,
+                card_number=result.card_number
+            )
 
         # Return success HTML page
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Inscripción Exitosa - Testing</title>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    text-align: center;
-                    padding: 50px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    background: white;
-                    padding: 30px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                    max-width: 500px;
-                    margin: 0 auto;
-                }}
-                .success {{ color: #28a745; }}
-                .card-info {{
-                    background: #f8f9fa;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .test-badge {{
-                    background: #007bff;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 12px;
-                    margin-bottom: 20px;
-                    display: inline-block;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="test-badge">TEST ENDPOINT</div>
-                <h1 class="success">✅ Inscripción Exitosa</h1>
-                <p>Tu tarjeta ha sido registrada correctamente en nuestro sistema.</p>
-                <div class="card-info">
-                    <p><strong>Usuario:</strong> {result.username}</p>
-                    <p><strong>Tipo de tarjeta:</strong> {result.card_type}</p>
-                    <p><strong>Número:</strong> {result.card_number}</p>
-                    <p><strong>Código de autorización:</strong> {result.authorization_code}</p>
-                    <p><strong>TBK User:</strong> {result.tbk_user[:15] if result.tbk_user else "N/A"}...</p>
-                </div>
-                <p><em>Este es un endpoint de testing para callbacks de Transbank.</em></p>
-                <p>Ya puedes cerrar esta ventana.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        return html_content
+        return _render(
+            _SUCCESS_PAGE,
+            username=_CALLBACK_USERNAME,
+            card_type=result.card_type,
+            card_number=result.card_number,
+            authorization_code=result.authorization_code,
+            tbk_user_prefix=tbk_user[:15] or "N/A"
+        )
 
     except TransactionRejectedException as e:
-        logger.warning(
+        _log.warning(
             "Inscription rejected by Transbank",
-            token_prefix=TBK_TOKEN[:10],
+            token_prefix=token_head10,
             error_code=e.code,
             error_message=e.message
         )
 
         # Return error HTML page
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Error en Inscripción - Testing</title>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    text-align: center;
-                    padding: 50px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    background: white;
-                    padding: 30px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                    max-width: 500px;
-                    margin: 0 auto;
-                }}
-                .error {{ color: #dc3545; }}
-                .test-badge {{
-                    background: #007bff;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 12px;
-                    margin-bottom: 20px;
-                    display: inline-block;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="test-badge">TEST ENDPOINT</div>
-                <h1 class="error">❌ Error en Inscripción</h1>
-                <p>Hubo un problema al procesar el registro de tu tarjeta.</p>
-                <p><strong>Error:</strong> {e.message}</p>
-                <p><strong>Token:</strong> {TBK_TOKEN[:15]}...</p>
-                <p><em>Este es un endpoint de testing para callbacks de Transbank.</em></p>
-                <p>Por favor, intenta nuevamente o contacta a soporte.</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        return html_content
+        return _render(_REJECTED_PAGE, error_message=e.message, token_prefix=token_head15)
         
     except Exception as e:
-        logger.error(
+        _log.error(
             "Error processing inscription result",
             error_type=type(e).__name__,
             error=str(e),
-            token_prefix=TBK_TOKEN[:10],
+            token_prefix=token_head10,
             exc_info=True
         )
         
         # Return error HTML page
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Error del Sistema - Testing</title>
-            <meta charset="UTF-8">
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    text-align: center; 
-                    padding: 50px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{ 
-                    background: white; 
-                    padding: 30px; 
-                    border-radius: 10px; 
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                    max-width: 500px;
-                    margin: 0 auto;
-                }}
-                .error {{ color: #dc3545; }}
-                .test-badge {{
-                    background: #007bff;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 12px;
-                    margin-bottom: 20px;
-                    display: inline-block;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="test-badge">TEST ENDPOINT</div>
-                <h1 class="error">❌ Error del Sistema</h1>
-                <p>Ocurrió un error inesperado al procesar tu solicitud.</p>
-                <p><strong>Token:</strong> {TBK_TOKEN[:15]}...</p>
-                <p><em>Este es un endpoint de testing para callbacks de Transbank.</em></p>
-                <p>Por favor, contacta a soporte técnico.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        return _render(_ERROR_PAGE, token_prefix=token_head15)
+
+
+_STATUS_TTL_SECONDS = 1.0
+_status_cache = {"expires_at": 0.0, "body": None}
 
 
 @router.get("/inscription/status")
 async def inscription_test_status():
     """
     Simple health check endpoint for testing callback infrastructure.
+
+    The body is serialized at most once per second; probes in between get
+    the cached bytes without going through FastAPI's JSON encoding.
     """
-    return {
-        "status": "active",
-        "service": "inscription_callback",
-        "message": "Callback endpoint is ready to receive Transbank responses",
-        "timestamp": datetime.utcnow().isoformat()
-    } 
\ No newline at end of file
+    now = monotonic()
+    if now >= _status_cache["expires_at"]:
+        _status_cache["body"] = orjson.dumps({
+            "status": "active",
+            "service": "inscription_callback",
+            "message": "Callback endpoint is ready to receive Transbank responses",
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        _status_cache["expires_at"] = now + _STATUS_TTL_SECONDS
+    return Response(content=_status_cache["body"], media_type="application/json") 
\ No newline at end of file
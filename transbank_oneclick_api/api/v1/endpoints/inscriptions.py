@@ -1,8 +1,10 @@
 import structlog
 from typing import Optional
 from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
 
-from transbank_oneclick_api.api.deps import get_transbank_service
+from transbank_oneclick_api.api.deps import (get_inscription_repository,
+                                             get_transbank_service)
 from transbank_oneclick_api.core.exceptions import InscriptionNotFoundException
 from transbank_oneclick_api.repositories.inscription_repository import \
     InscriptionRepository
@@ -30,20 +32,10 @@ async def start_inscription(
     - Call service
     - Return standardized response
     """
-    try:
-        logger.info("Starting inscription endpoint", username=request.username)
+    logger.info("Starting inscription endpoint", username=request.username)
 
-        # Service returns Pydantic schema and handles all DB operations
-        return ApiResponse.success_response(await transbank_service.start_inscription(request))
-
-    except Exception as e:
-        logger.error(
-            "Error starting inscription",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    # Service returns Pydantic schema and handles all DB operations
+    return ApiResponse.success_response(await transbank_service.start_inscription(request))
 
 
 @router.put("/finish", response_model=ApiResponse[InscriptionFinishResponse])
@@ -68,7 +60,7 @@ async def finish_inscription(
 async def delete_inscription(
     request: InscriptionDeleteRequest,
     transbank_service: TransbankService = Depends(get_transbank_service),
-    inscription_repo: InscriptionRepository = Depends()
+    inscription_repo: InscriptionRepository = Depends(get_inscription_repository)
 ):
     """
     Delete card inscription.
@@ -81,37 +73,27 @@ async def delete_inscription(
 
     NO database commit/rollback - Service handles transactions.
     """
-    try:
-        logger.info("Deleting inscription endpoint", username=request.username)
-
-        # 1. Find inscription (via repository, not direct query)
-        inscription = inscription_repo.get_active_by_username(request.username)
+    logger.info("Deleting inscription endpoint", username=request.username)
 
-        if not inscription:
-            raise InscriptionNotFoundException(request.username)
+    # 1. Find inscription (via repository, not direct query)
+    # Blocking query, so keep it off the event loop
+    inscription = await run_in_threadpool(
+        inscription_repo.get_active_by_username, request.username
+    )
 
-        # 2. Service handles Transbank API call and DB deletion
-        await transbank_service.delete_inscription(
-            tbk_user=inscription.tbk_user,
-            username=request.username
-        )
+    if not inscription:
+        raise InscriptionNotFoundException(request.username)
 
-        logger.info("Inscription deleted successfully", username=request.username)
+    # 2. Service handles Transbank API call and DB deletion
+    await transbank_service.delete_inscription(inscription)
 
-        return ApiResponse.success_response(None)
+    logger.info("Inscription deleted successfully", username=request.username)
 
-    except Exception as e:
-        logger.error(
-            "Error deleting inscription",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    return ApiResponse.success_response(None)
 
 
 @router.get("/{username}", response_model=ApiResponse[InscriptionListResponse])
-async def list_user_inscriptions(
+def list_user_inscriptions(
     username: str,
     is_active: Optional[bool] = None,
     transbank_service: TransbankService = Depends(get_transbank_service)
@@ -124,24 +106,16 @@ async def list_user_inscriptions(
     - Call service
     - Return standardized response
 
+    Declared sync so FastAPI runs the blocking query in its threadpool.
+
     Query parameters:
     - is_active: Optional filter. If True, returns only active inscriptions.
                  If False, returns only inactive inscriptions.
                  If None (default), returns all inscriptions.
     """
-    try:
-        logger.info("Listing user inscriptions", username=username, is_active=is_active)
-
-        # Service handles repository call and ORM to Pydantic conversion
-        return ApiResponse.success_response(
-            await transbank_service.list_user_inscriptions(username, is_active)
-        )
-
-    except Exception as e:
-        logger.error(
-            "Error retrieving inscriptions",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.info("Listing user inscriptions", username=username, is_active=is_active)
+
+    # Service handles repository call and ORM to Pydantic conversion
+    return ApiResponse.success_response(
+        transbank_service.list_user_inscriptions(username, is_active)
+    )
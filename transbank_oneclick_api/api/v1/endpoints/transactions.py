@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, Query
-from typing import Optional
+from pydantic import TypeAdapter
+from typing import List, Optional
 import structlog
 
 from transbank_oneclick_api.services.transbank_service import TransbankService
 from transbank_oneclick_api.api.deps import get_transbank_service
 from transbank_oneclick_api.schemas.oneclick_schemas import (
     TransactionAuthorizeRequest,
+    TransactionDetail,
     TransactionAuthorizeResponse,
     TransactionStatusResponse,
     TransactionCaptureRequest,
@@ -15,14 +17,13 @@ from transbank_oneclick_api.schemas.oneclick_schemas import (
     TransactionHistoryResponse
 )
 from transbank_oneclick_api.schemas.response_models import ApiResponse
-from transbank_oneclick_api.core.exceptions import (
-    InscriptionNotFoundException,
-    OrdenCompraDuplicadaException
-)
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
 
+# Dumps the whole details list in one call through a shared core schema
+_DETAILS_ADAPTER = TypeAdapter(List[TransactionDetail])
+
 
 @router.post("/authorize", response_model=ApiResponse[TransactionAuthorizeResponse])
 async def authorize_transaction(
@@ -44,34 +45,22 @@ async def authorize_transaction(
     - Persist transaction
     - Database commit/rollback
     """
-    try:
-        logger.info("Authorizing transaction endpoint", username=request.username)
-
-        # Service handles all validation, business logic, and DB operations
-        result = await transbank_service.authorize_transaction(
-            username=request.username,
-            buy_order=request.parent_buy_order,
-            details=[detail.model_dump() for detail in request.details]
-        )
-
-        logger.info(
-            "Transaction authorized successfully",
-            username=request.username,
-            parent_buy_order=request.parent_buy_order
-        )
-
-        return ApiResponse.success_response(result)
-
-    except (OrdenCompraDuplicadaException, InscriptionNotFoundException):
-        raise
-    except Exception as e:
-        logger.error(
-            "Error authorizing transaction",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.debug("Authorizing transaction endpoint", username=request.username)
+
+    # Service handles all validation, business logic, and DB operations
+    result = await transbank_service.authorize_transaction(
+        username=request.username,
+        buy_order=request.parent_buy_order,
+        details=_DETAILS_ADAPTER.dump_python(request.details)
+    )
+
+    logger.info(
+        "Transaction authorized successfully",
+        username=request.username,
+        parent_buy_order=request.parent_buy_order
+    )
+
+    return ApiResponse.success_response(result)
 
 
 @router.get("/status/{child_buy_order}", response_model=ApiResponse[TransactionStatusResponse])
@@ -90,34 +79,24 @@ async def get_transaction_status(
 
     Service returns Pydantic schema directly.
     """
-    try:
-        logger.info(
-            "Getting transaction status endpoint",
-            child_buy_order=child_buy_order,
-            child_commerce_code=child_commerce_code
-        )
-
-        # Service returns TransactionStatusResponse (Pydantic)
-        result = await transbank_service.get_transaction_status(
-            child_buy_order=child_buy_order,
-            child_commerce_code=child_commerce_code
-        )
-
-        logger.info(
-            "Transaction status retrieved successfully",
-            child_buy_order=child_buy_order
-        )
-
-        return ApiResponse.success_response(result)
-
-    except Exception as e:
-        logger.error(
-            "Error getting transaction status",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.debug(
+        "Getting transaction status endpoint",
+        child_buy_order=child_buy_order,
+        child_commerce_code=child_commerce_code
+    )
+
+    # Service returns TransactionStatusResponse (Pydantic)
+    result = await transbank_service.get_transaction_status(
+        child_buy_order=child_buy_order,
+        child_commerce_code=child_commerce_code
+    )
+
+    logger.info(
+        "Transaction status retrieved successfully",
+        child_buy_order=child_buy_order
+    )
+
+    return ApiResponse.success_response(result)
 
 
 @router.put("/capture", response_model=ApiResponse[TransactionCaptureResponse])
@@ -135,37 +114,27 @@ async def capture_transaction(
 
     Service returns Pydantic schema directly.
     """
-    try:
-        logger.info(
-            "Capturing transaction endpoint",
-            child_buy_order=request.child_buy_order,
-            capture_amount=request.capture_amount
-        )
-
-        # Service returns TransactionCaptureResponse (Pydantic)
-        result = await transbank_service.capture_transaction(
-            child_commerce_code=request.child_commerce_code,
-            child_buy_order=request.child_buy_order,
-            authorization_code=request.authorization_code,
-            capture_amount=request.capture_amount
-        )
-
-        logger.info(
-            "Transaction captured successfully",
-            child_buy_order=request.child_buy_order,
-            captured_amount=request.capture_amount
-        )
-
-        return ApiResponse.success_response(result)
-
-    except Exception as e:
-        logger.error(
-            "Error capturing transaction",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.debug(
+        "Capturing transaction endpoint",
+        child_buy_order=request.child_buy_order,
+        capture_amount=request.capture_amount
+    )
+
+    # Service returns TransactionCaptureResponse (Pydantic)
+    result = await transbank_service.capture_transaction(
+        child_commerce_code=request.child_commerce_code,
+        child_buy_order=request.child_buy_order,
+        authorization_code=request.authorization_code,
+        capture_amount=request.capture_amount
+    )
+
+    logger.info(
+        "Transaction captured successfully",
+        child_buy_order=request.child_buy_order,
+        captured_amount=request.capture_amount
+    )
+
+    return ApiResponse.success_response(result)
 
 
 @router.post("/refund", response_model=ApiResponse[TransactionRefundResponse])
@@ -183,36 +152,26 @@ async def refund_transaction(
 
     Service returns Pydantic schema directly.
     """
-    try:
-        logger.info(
-            "Refunding transaction endpoint",
-            child_buy_order=request.child_buy_order,
-            amount=request.amount
-        )
-
-        # Service returns TransactionRefundResponse (Pydantic)
-        result = await transbank_service.refund_transaction(
-            child_commerce_code=request.child_commerce_code,
-            child_buy_order=request.child_buy_order,
-            amount=request.amount
-        )
-
-        logger.info(
-            "Transaction refunded successfully",
-            child_buy_order=request.child_buy_order,
-            reversed_amount=request.amount
-        )
-
-        return ApiResponse.success_response(result)
-
-    except Exception as e:
-        logger.error(
-            "Error refunding transaction",
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.debug(
+        "Refunding transaction endpoint",
+        child_buy_order=request.child_buy_order,
+        amount=request.amount
+    )
+
+    # Service returns TransactionRefundResponse (Pydantic)
+    result = await transbank_service.refund_transaction(
+        child_commerce_code=request.child_commerce_code,
+        child_buy_order=request.child_buy_order,
+        amount=request.amount
+    )
+
+    logger.info(
+        "Transaction refunded successfully",
+        child_buy_order=request.child_buy_order,
+        reversed_amount=request.amount
+    )
+
+    return ApiResponse.success_response(result)
 
 
 @router.get("/history/{username}", response_model=ApiResponse[TransactionHistoryResponse])
@@ -239,39 +198,28 @@ async def get_transaction_history(
     - Pagination logic
     - Filtering (start_date, end_date, status)
     """
-    try:
-        logger.info(
-            "Getting transaction history endpoint",
-            username=username,
-            page=page,
-            limit=limit
-        )
-
-        # Service handles all data retrieval and conversion
-        result = await transbank_service.get_transaction_history(
-            username=username,
-            start_date=start_date,
-            end_date=end_date,
-            status=status,
-            page=page,
-            limit=limit
-        )
-
-        logger.info(
-            "Retrieved transaction history",
-            username=username,
-            count=len(result.transactions),
-            page=page
-        )
-
-        return ApiResponse.success_response(result)
-
-    except Exception as e:
-        logger.error(
-            "Error getting transaction history",
-            username=username,
-            error_type=type(e).__name__,
-            error=str(e),
-            exc_info=True
-        )
-        raise
+    logger.debug(
+        "Getting transaction history endpoint",
+        username=username,
+        page=page,
+        limit=limit
+    )
+
+    # Service handles all data retrieval and conversion
+    result = await transbank_service.get_transaction_history(
+        username=username,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        page=page,
+        limit=limit
+    )
+
+    logger.info(
+        "Retrieved transaction history",
+        username=username,
+        count=len(result.transactions),
+        page=page
+    )
+
+    return ApiResponse.success_response(result)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from .endpoints import inscriptions, transactions, callbacks
+from .endpoints import inscriptions, transactions
+from transbank_oneclick_api.config import settings
 
 api_router = APIRouter()
 
@@ -15,8 +16,12 @@ api_router.include_router(
     tags=["transactions"]
 )
 
-api_router.include_router(
-    callbacks.router,
-    prefix="/callbacks",
-    tags=["testing", "callbacks"]
-)
\ No newline at end of file
+# Testing callbacks are never imported, let alone served, in production
+if settings.ENVIRONMENT != "production":
+    from .endpoints import callbacks
+
+    api_router.include_router(
+        callbacks.router,
+        prefix="/callbacks",
+        tags=["testing", "callbacks"]
+    )
\ No newline at end of file
@@ -6,7 +6,8 @@ from typing import List, Optional
 project_name = os.getenv("PROJECT_NAME", "transbank-oneclick-api")
 custom_env_file = f".env.{project_name}"
 
-env_file = custom_env_file if os.path.exists(custom_env_file) else ".env"
+# ENV_FILE permite resolver el archivo una sola vez y pasarlo a cada worker
+env_file = os.getenv("ENV_FILE") or (custom_env_file if os.path.exists(custom_env_file) else ".env")
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Transbank Oneclick API"
@@ -20,6 +21,13 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_ENCRYPT_KEY: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    # Crea las tablas al iniciar (solo dev/test); en producción el esquema
+    # lo maneja Alembic
+    DB_AUTO_CREATE: bool = False
     
     # Transbank Configuration
     TRANSBANK_ENVIRONMENT: str = "integration"
@@ -39,6 +47,9 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     SERVICE_NAME: str = "api-transbank"
     SERVICE_VERSION: str = "1.0.0"
+    # Fraction of successful inscription callbacks that emit info logs;
+    # warnings and errors are always logged
+    CALLBACK_LOG_SAMPLE_RATE: float = 1.0
     
     # Rate Limiting
     RATE_LIMIT_INSCRIPTION: int = 10
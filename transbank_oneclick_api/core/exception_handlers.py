@@ -1,6 +1,8 @@
+from functools import lru_cache
+
 import structlog
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from .exceptions import DomainException
@@ -8,7 +10,13 @@ from .exceptions import DomainException
 logger = structlog.get_logger(__name__)
 
 
-async def domain_exception_handler(request: Request, exc: DomainException) -> JSONResponse:
+@lru_cache(maxsize=512)
+def _format_loc(loc: tuple) -> str:
+    """Join a validation error location into a dotted field name"""
+    return '.'.join(map(str, loc)) or 'unknown'
+
+
+async def domain_exception_handler(request: Request, exc: DomainException) -> ORJSONResponse:
     """
     Handle domain layer exceptions.
 
@@ -23,7 +31,7 @@ async def domain_exception_handler(request: Request, exc: DomainException) -> JS
         details=exc.details
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.http_status,
         content={
             "code": exc.code,
@@ -33,7 +41,7 @@ async def domain_exception_handler(request: Request, exc: DomainException) -> JS
     )
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> ORJSONResponse:
     """Handle FastAPI HTTP exceptions."""
     logger.warning(
         "HTTP exception occurred",
@@ -43,7 +51,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         method=request.method
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "code": str(exc.status_code),
@@ -53,7 +61,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     )
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
     """Handle Pydantic validation errors."""
     validation_errors = exc.errors()
 
@@ -65,16 +73,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
     # Format validation errors for response
-    error_details = []
-    for error in validation_errors:
-        field_name = '.'.join(str(x) for x in error['loc']) if error['loc'] else 'unknown'
-        error_details.append({
-            "field": field_name,
+    error_details = [
+        {
+            "field": _format_loc(tuple(error['loc'])),
             "message": error['msg'],
             "type": error['type']
-        })
+        }
+        for error in validation_errors
+    ]
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "code": "01",  # BAD_REQUEST code
@@ -84,7 +92,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle unexpected errors."""
     logger.error(
         "Unexpected error occurred",
@@ -95,7 +103,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         exc_info=True
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "code": "500",  # INTERNAL_ERROR code
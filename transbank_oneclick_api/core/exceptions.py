@@ -1,4 +1,4 @@
-from transbank_oneclick_api.core.response_codes import ResponseCode
+from transbank_oneclick_api.core.response_codes import ResponseCode, ResponseCodes
 
 
 class DomainException(Exception):
@@ -39,7 +39,6 @@ class DomainException(Exception):
 class ClientNotFoundedException(DomainException):
     """Exception for client not found."""
     def __init__(self, client_id: int):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.CLIENT_NOT_FOUND,
             custom_message=f"Cliente con ID {client_id} no encontrado"
@@ -49,7 +48,6 @@ class ClientNotFoundedException(DomainException):
 class UserNotFoundedException(DomainException):
     """Exception for user not found."""
     def __init__(self, username: str):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.NOT_FOUND,
             custom_message=f"Usuario {username} no encontrado"
@@ -59,7 +57,6 @@ class UserNotFoundedException(DomainException):
 class InscriptionNotFoundException(DomainException):
     """Exception for inscription not found."""
     def __init__(self, username: str):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.INSCRIPTION_NOT_FOUND,
             custom_message=f"Inscription not found for user: {username}"
@@ -69,7 +66,6 @@ class InscriptionNotFoundException(DomainException):
 class TransactionRejectedException(DomainException):
     """Exception for rejected transactions."""
     def __init__(self, response_code: int, message: str = None):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         default_message = f"Transacción rechazada con código {response_code}"
         super().__init__(
             ResponseCodes.TRANSACTION_REJECTED,
@@ -81,7 +77,6 @@ class TransactionRejectedException(DomainException):
 class TokenExpiradoException(DomainException):
     """Exception for expired inscription token."""
     def __init__(self):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.INSCRIPTION_EXPIRED,
             custom_message="Token de inscripción expirado"
@@ -91,7 +86,6 @@ class TokenExpiradoException(DomainException):
 class OrdenCompraDuplicadaException(DomainException):
     """Exception for duplicate buy order."""
     def __init__(self, buy_order: str):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.ORDEN_COMPRA_DUPLICADA,
             custom_message=f"Orden de compra {buy_order} ya existe",
@@ -102,7 +96,6 @@ class OrdenCompraDuplicadaException(DomainException):
 class InvalidAmountException(DomainException):
     """Exception for invalid transaction amount."""
     def __init__(self, amount: int):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.INVALID_AMOUNT,
             custom_message=f"Monto {amount} es inválido",
@@ -113,7 +106,6 @@ class InvalidAmountException(DomainException):
 class TransbankCommunicationException(DomainException):
     """Exception for Transbank communication errors."""
     def __init__(self, original_error: str):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(
             ResponseCodes.TRANSBANK_COMMUNICATION_ERROR,
             custom_message=f"Error de comunicación con Transbank: {original_error}",
@@ -124,5 +116,4 @@ class TransbankCommunicationException(DomainException):
 class InsufficientBalanceException(DomainException):
     """Exception for insufficient balance."""
     def __init__(self):
-        from transbank_oneclick_api.core.response_codes import ResponseCodes
         super().__init__(ResponseCodes.INSUFFICIENT_BALANCE)
\ No newline at end of file
@@ -1,85 +1,243 @@
 import logging
-import json
+import logging.handlers
+import queue
 import os
-from datetime import datetime
+import time
 from contextvars import ContextVar
-from typing import Optional
-import structlog
+from typing import Optional, Tuple
+import orjson
 import sys
 
-correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
-endpoint_var: ContextVar[Optional[str]] = ContextVar('endpoint', default=None)
-method_var: ContextVar[Optional[str]] = ContextVar('method', default=None)
+# (correlation_id, endpoint, method) en una sola variable para que el
+# formatter haga una única lectura por registro; la fija CorrelationMiddleware
+request_context_var: ContextVar[Tuple[Optional[str], Optional[str], Optional[str]]] = ContextVar(
+    'request_context', default=(None, None, None)
+)
+
+# Fijos durante toda la vida del proceso: se resuelven una sola vez
+_ARTIFACT = os.getenv("SERVICE_NAME", "api-transbank")
+_VERSION = os.getenv("SERVICE_VERSION", "1.0.0")
+
+_ORJSON_OPTS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# Plantilla compilada: las claves y los campos estáticos ya van serializados,
+# en cada registro solo se serializan los valores dinámicos entre las piezas
+_TIMESTAMP_KEY = b'{"@timestamp":'
+_LEVEL_KEY = b',"level":'
+_STATIC_FIELDS = (
+    b',"artifact":' + orjson.dumps(_ARTIFACT)
+    + b',"version":' + orjson.dumps(_VERSION)
+    + b',"correlation_id":'
+)
+_ENDPOINT_KEY = b',"endpoint":'
+_METHOD_KEY = b',"method":'
+_MESSAGE_KEY = b',"message":'
+_CONTEXT_KEY = b',"context":'
+_ERROR_KEY = b',"error":'
+_TRACEBACK_KEY = b',"traceback":'
+
+# Prefijo ISO del último segundo formateado; solo se recalcula al cambiar
+# de segundo y por registro únicamente se agregan los microsegundos
+_ts_cache = (0, b'')
+
+
+def _timestamp() -> bytes:
+    global _ts_cache
+    # Enteros en nanosegundos: restar floats trunca los microsegundos
+    sec, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime('"%Y-%m-%dT%H:%M:%S', time.gmtime(sec)).encode()
+        _ts_cache = (sec, prefix)
+    return b'%s.%06dZ"' % (prefix, nanos // 1000)
 
 
 class StructuredFormatter(logging.Formatter):
     def format(self, record):
-        log_entry = {
-            "@timestamp": datetime.utcnow().isoformat() + "Z",
-            "level": record.levelname,
-            "artifact": os.getenv("SERVICE_NAME", "api-transbank"),
-            "version": os.getenv("SERVICE_VERSION", "1.0.0"),
-            "correlation_id": correlation_id_var.get(),
-            "endpoint": endpoint_var.get(),
-            "method": method_var.get(),
-            "message": record.getMessage(),
-        }
-        
+        return self.format_bytes(record).decode()
+
+    def format_bytes(self, record) -> bytearray:
+        dumps = orjson.dumps
+        out = bytearray(_TIMESTAMP_KEY)
+        out += _timestamp()
+        out += _LEVEL_KEY
+        out += dumps(record.levelname)
+        correlation_id, endpoint, method = request_context_var.get()
+        out += _STATIC_FIELDS
+        out += dumps(correlation_id)
+        out += _ENDPOINT_KEY
+        out += dumps(endpoint)
+        out += _METHOD_KEY
+        out += dumps(method)
+        out += _MESSAGE_KEY
+        out += dumps(record.getMessage())
+
         if hasattr(record, 'context'):
-            log_entry["context"] = record.context
-            
+            out += _CONTEXT_KEY
+            out += dumps(record.context, option=_ORJSON_OPTS)
+
         if hasattr(record, 'error'):
-            log_entry["error"] = record.error
-            
+            out += _ERROR_KEY
+            out += dumps(record.error, option=_ORJSON_OPTS)
+
         if record.exc_info:
-            log_entry["traceback"] = self.formatException(record.exc_info)
-            
-        return json.dumps(log_entry)
+            out += _TRACEBACK_KEY
+            out += dumps(self.formatException(record.exc_info))
+
+        out += b'}'
+        return out
+
+
+class _QueueBytesLogger:
+    """
+    Logger de structlog que solo encola los bytes ya renderizados; la
+    escritura a stdout la hace el QueueListener en su propio hilo
+    """
+    __slots__ = ("_put",)
+
+    def __init__(self, log_queue: queue.SimpleQueue):
+        self._put = log_queue.put
+
+    def msg(self, message: bytes) -> None:
+        self._put((message, False))
+
+    def error(self, message: bytes) -> None:
+        self._put((message, True))
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = critical = exception = error
+
+
+class _QueueJsonHandler(logging.Handler):
+    """
+    Handler raíz en modo JSON: los registros de la librería estándar
+    (uvicorn, SQLAlchemy, SDK de Transbank) se formatean en el hilo que los
+    emite, donde el contexto del request sigue visible, y se encolan para el
+    mismo listener que structlog
+    """
 
+    def __init__(self, log_queue: queue.SimpleQueue, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._put = log_queue.put
+        self._formatter = StructuredFormatter()
 
-def setup_logging(log_level: str = "INFO", json_logs: bool = True):
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._put((self._formatter.format_bytes(record), record.levelno >= logging.ERROR))
+        except Exception:
+            self.handleError(record)
+
+
+class _StdoutBytesHandler:
+    """
+    Destino del QueueListener en modo JSON: agrupa los registros en el
+    buffer de stdout y hace flush al llegar un ERROR o cuando la cola queda
+    vacía, así ningún registro espera más que la siguiente pausa
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue):
+        self._queue_empty = log_queue.empty
+        self._write = sys.stdout.buffer.write
+        self.flush = sys.stdout.buffer.flush
+
+    def handle(self, item) -> None:
+        message, flush = item
+        self._write(message + b"\n")
+        if flush or self._queue_empty():
+            self.flush()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener que vacía los buffers de sus handlers al detenerse"""
+
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+def setup_logging(log_level: str = "INFO", json_logs: bool = True) -> logging.handlers.QueueListener:
     """
     Configura structlog para la aplicación FastAPI
     
     Args:
         log_level: Nivel de logging (DEBUG, INFO, WARNING, ERROR)
         json_logs: Si usar formato JSON o formato legible para desarrollo
+
+    Returns:
+        QueueListener: Hilo que escribe los logs; detenerlo al apagar la app.
     """
-    
+    # Solo quien configura el logging paga la importación de structlog;
+    # el formatter y las ContextVar de este módulo no lo necesitan
+    import structlog
+
+    level = getattr(logging, log_level.upper())
+    # Los requests solo encolan; el listener escribe a stdout en su propio hilo
+    log_queue = queue.SimpleQueue()
+
+    if json_logs:
+        # Producción: orjson genera bytes que el listener escribe en
+        # sys.stdout.buffer, sin pasar por LogRecord ni por una decodificación
+        # intermedia; varios registros se agrupan en una sola escritura
+        queue_logger = _QueueBytesLogger(log_queue)
+        structlog.configure(
+            processors=[
+                structlog.contextvars.merge_contextvars,
+                structlog.processors.add_log_level,
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.dict_tracebacks,
+                structlog.processors.JSONRenderer(serializer=orjson.dumps)
+            ],
+            # Drops calls below log_level before any processor runs
+            wrapper_class=structlog.make_filtering_bound_logger(level),
+            logger_factory=lambda *args: queue_logger,
+            cache_logger_on_first_use=True,
+        )
+        # Sin esto los loggers de la librería estándar caerían en
+        # logging.lastResort como texto plano en stderr
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if isinstance(h, _QueueJsonHandler)]:
+            root.removeHandler(handler)
+        root.addHandler(_QueueJsonHandler(log_queue))
+        root.setLevel(level)
+
+        listener = _FlushingQueueListener(log_queue, _StdoutBytesHandler(log_queue))
+        listener.start()
+        return listener
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
     # Configurar el logging estándar de Python
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        level=level,
     )
+    listener.start()
     
-    # Procesadores comunes
-    shared_processors = [
+    # Procesadores para desarrollo (más legible)
+    processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
+        structlog.processors.ExceptionPrettyPrinter(),
+        structlog.dev.ConsoleRenderer(colors=True)
     ]
     
-    if json_logs:
-        # Procesadores para producción (JSON)
-        processors = shared_processors + [
-            structlog.processors.dict_tracebacks,
-            structlog.processors.JSONRenderer()
-        ]
-    else:
-        # Procesadores para desarrollo (más legible)
-        processors = shared_processors + [
-            structlog.processors.ExceptionPrettyPrinter(),
-            structlog.dev.ConsoleRenderer(colors=True)
-        ]
-    
     # Configurar structlog
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Drops calls below log_level before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
-    )
\ No newline at end of file
+    )
+
+    return listener
@@ -1,6 +1,8 @@
 from contextvars import ContextVar
 from typing import Optional
 
+from .logging_config import request_context_var
+
 """
 Context variables for request tracing and logging.
 
@@ -9,33 +11,14 @@ async call stacks, making them available to all logging calls within
 the same request context.
 
 Usage:
-    # In middleware:
-    correlation_id_var.set(str(uuid.uuid4()))
-    endpoint_var.set(str(request.url.path))
+    # In middleware (CorrelationMiddleware already does this):
+    request_context_var.set((correlation_id, str(request.url.path), request.method))
 
     # In any function within the request:
-    correlation_id = correlation_id_var.get()
+    correlation_id, endpoint, method = request_context_var.get()
     logger.info("Processing request", correlation_id=correlation_id)
 """
 
-# Unique identifier for tracing requests across services
-correlation_id_var: ContextVar[Optional[str]] = ContextVar(
-    'correlation_id',
-    default=None
-)
-
-# Current endpoint path
-endpoint_var: ContextVar[Optional[str]] = ContextVar(
-    'endpoint',
-    default=None
-)
-
-# HTTP method (GET, POST, etc.)
-method_var: ContextVar[Optional[str]] = ContextVar(
-    'method',
-    default=None
-)
-
 # User identifier for the current request
 user_id_var: ContextVar[Optional[str]] = ContextVar(
     'user_id',
@@ -133,6 +133,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         """Log cuando hay un error en la request"""
         client_ip = self._get_client_ip(request)
         
+        # Sin traceback: general_exception_handler lo registra al re-lanzar
         logger.error(
             "Request failed",
             method=request.method,
@@ -142,7 +143,6 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             process_time_ms=round(process_time * 1000, 2),
             client_ip=client_ip,
             request_size=request_size,
-            exc_info=True,
         )
     
     def _get_client_ip(self, request: Request) -> str:
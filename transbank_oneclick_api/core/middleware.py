@@ -1,7 +1,7 @@
 import uuid
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from .logging_config import correlation_id_var, endpoint_var, method_var
+from .logging_config import request_context_var
 from fastapi.responses import JSONResponse
 from transbank_oneclick_api.config import settings
 
@@ -12,9 +12,7 @@ class CorrelationMiddleware(BaseHTTPMiddleware):
         endpoint = str(request.url.path)
         method = request.method
         
-        correlation_id_var.set(correlation_id)
-        endpoint_var.set(endpoint)
-        method_var.set(method)
+        request_context_var.set((correlation_id, endpoint, method))
         
         response = await call_next(request)
         response.headers["X-Correlation-ID"] = correlation_id
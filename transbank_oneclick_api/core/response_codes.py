@@ -144,3 +144,21 @@ class ResponseCodes:
         "Invalid client data",
         400
     )
+
+    @classmethod
+    def by_code(cls, code: str) -> ResponseCode:
+        """
+        Look up a response code by its string code (e.g. "INS_001").
+
+        Raises:
+            KeyError: If no response code is registered under ``code``
+        """
+        return cls._BY_CODE[code]
+
+
+# Built once at import so by_code() is a single dict lookup
+ResponseCodes._BY_CODE = {
+    value.code: value
+    for value in vars(ResponseCodes).values()
+    if isinstance(value, ResponseCode)
+}
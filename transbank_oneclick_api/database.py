@@ -1,4 +1,8 @@
+import threading
+from functools import lru_cache
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
 from transbank_oneclick_api.config import settings
@@ -6,6 +10,29 @@ from transbank_oneclick_api.models.base import Base
 
 engine = None
 SessionLocal = None
+# Serializes initialization so concurrent first requests build the
+# engine (and run create_all) only once
+_init_lock = threading.RLock()
+
+@lru_cache(maxsize=4)
+def _build_engine(database_url):
+    """Create the engine (and, if enabled, its tables) once per database URL"""
+    pool_options = {}
+    # SQLite uses a single-connection pool that takes no sizing options
+    if make_url(database_url).get_backend_name() != "sqlite":
+        pool_options = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING
+        }
+    new_engine = create_engine(database_url, **pool_options)
+    
+    # Create all tables if they don't exist (dev/test; production runs Alembic)
+    if settings.DB_AUTO_CREATE:
+        Base.metadata.create_all(bind=new_engine)
+    
+    return new_engine
 
 def init_db(database_url=None):
     """Initialize database connection"""
@@ -14,20 +41,31 @@ def init_db(database_url=None):
     if database_url is None:
         database_url = settings.DATABASE_URL
     
-    engine = create_engine(database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    # Create all tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    with _init_lock:
+        engine = _build_engine(database_url)
+        SessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            # Committed objects keep their loaded state; no reload on next access
+            expire_on_commit=False,
+            bind=engine
+        )
     
     return engine
 
+def _ensure_session_factory():
+    """Initialize the database on first use, at most once across threads"""
+    with _init_lock:
+        if SessionLocal is None:
+            init_db()
+        return SessionLocal
+
 def get_db():
     """Get a database session"""
-    if SessionLocal is None:
-        init_db()
+    # Double-checked: after startup this is a single global read
+    session_factory = SessionLocal or _ensure_session_factory()
         
-    db = SessionLocal()
+    db = session_factory()
     try:
         yield db
     finally:
@@ -11,8 +11,20 @@ class InscriptionStatus(str, Enum):
     FAILED = "FAILED"
     EXPIRED = "EXPIRED"
 
+    @classmethod
+    def from_wire(cls, code: str) -> "InscriptionStatus":
+        """Get the status for a database string code."""
+        try:
+            return _INSCRIPTION_STATUS_FROM_WIRE[code]
+        except KeyError:
+            raise ValueError(f"{code!r} is not a valid {cls.__name__}") from None
 
-@dataclass
+
+# Plain dict lookup instead of going through Enum.__call__ per conversion
+_INSCRIPTION_STATUS_FROM_WIRE = {status.value: status for status in InscriptionStatus}
+
+
+@dataclass(slots=True)
 class CardDetails:
     """Value Object for card information."""
     card_type: str
@@ -30,7 +42,7 @@ class CardDetails:
         return self.card_number.startswith("****")
 
 
-@dataclass
+@dataclass(slots=True)
 class InscriptionEntity:
     """
     Domain Entity for Oneclick Inscription.
@@ -1,39 +1,97 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
-from enum import Enum
+from typing import Iterator, List, Optional
+from enum import IntEnum
 from decimal import Decimal
 
 
-class TransactionStatus(str, Enum):
-    """Status values for transaction."""
-    AUTHORIZED = "AUTHORIZED"
-    REVERSED = "REVERSED"
-    FAILED = "FAILED"
-    CAPTURED = "CAPTURED"
+class TransactionStatus(IntEnum):
+    """
+    Status values for transaction.
+
+    Integer-valued so status checks compare ints; use to_wire/from_wire
+    to convert to and from the string codes stored in the database.
+    """
+    AUTHORIZED = 1
+    REVERSED = 2
+    FAILED = 3
+    CAPTURED = 4
 
+    def to_wire(self) -> str:
+        """Get the string code used by the database and Transbank."""
+        return _TRANSACTION_STATUS_TO_WIRE[self]
 
-class PaymentType(str, Enum):
-    """Payment type codes from Transbank."""
-    VENTA_DEBITO = "VD"
-    VENTA_CREDITO = "VN"
-    VENTA_3_CUOTAS = "VC"
-    VENTA_CUOTAS = "VN"
-    VENTA_PREPAGO = "VP"
-    VENTA_SIN_CVV = "S2"
-    VENTA_SIN_CVV_CUOTAS = "SI"
+    @classmethod
+    def from_wire(cls, code: str) -> "TransactionStatus":
+        """Get the status for a database/Transbank string code."""
+        try:
+            return _TRANSACTION_STATUS_FROM_WIRE[code]
+        except KeyError:
+            raise ValueError(f"{code!r} is not a valid {cls.__name__}") from None
 
 
-@dataclass
+class PaymentType(IntEnum):
+    """
+    Payment type codes from Transbank.
+
+    Integer-valued; the official Transbank codes are available through
+    to_wire/from_wire.
+    """
+    VENTA_DEBITO = 1
+    VENTA_CREDITO = 2
+    VENTA_3_CUOTAS = 3
+    VENTA_CUOTAS = 2  # Transbank reports installments sales as "VN" too
+    VENTA_PREPAGO = 4
+    VENTA_SIN_CVV = 5
+    VENTA_SIN_CVV_CUOTAS = 6
+
+    def to_wire(self) -> str:
+        """Get the official Transbank payment type code."""
+        return _PAYMENT_TYPE_TO_WIRE[self]
+
+    @classmethod
+    def from_wire(cls, code: str) -> "PaymentType":
+        """Get the payment type for an official Transbank code."""
+        try:
+            return _PAYMENT_TYPE_FROM_WIRE[code]
+        except KeyError:
+            raise ValueError(f"{code!r} is not a valid {cls.__name__}") from None
+
+
+_TRANSACTION_STATUS_TO_WIRE = {
+    TransactionStatus.AUTHORIZED: "AUTHORIZED",
+    TransactionStatus.REVERSED: "REVERSED",
+    TransactionStatus.FAILED: "FAILED",
+    TransactionStatus.CAPTURED: "CAPTURED",
+}
+_TRANSACTION_STATUS_FROM_WIRE = {
+    code: status for status, code in _TRANSACTION_STATUS_TO_WIRE.items()
+}
+
+_PAYMENT_TYPE_TO_WIRE = {
+    PaymentType.VENTA_DEBITO: "VD",
+    PaymentType.VENTA_CREDITO: "VN",
+    PaymentType.VENTA_3_CUOTAS: "VC",
+    PaymentType.VENTA_PREPAGO: "VP",
+    PaymentType.VENTA_SIN_CVV: "S2",
+    PaymentType.VENTA_SIN_CVV_CUOTAS: "SI",
+}
+_PAYMENT_TYPE_FROM_WIRE = {
+    code: payment_type for payment_type, code in _PAYMENT_TYPE_TO_WIRE.items()
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Amount:
     """Value Object for monetary amounts."""
     value: int  # Amount in smallest currency unit (e.g., cents)
 
     def __post_init__(self):
         """Validate amount."""
-        if self.value < 0:
-            raise ValueError("Amount cannot be negative")
-        if self.value == 0:
+        # Valid amounts pass a single comparison
+        if self.value <= 0:
+            if self.value < 0:
+                raise ValueError("Amount cannot be negative")
             raise ValueError("Amount must be greater than zero")
 
     def to_decimal(self) -> Decimal:
@@ -44,7 +102,7 @@ class Amount:
         return f"${self.to_decimal():.2f}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionDetail:
     """Domain Entity for transaction detail (per commerce)."""
     commerce_code: str
@@ -79,12 +137,16 @@ class TransactionDetail:
         return self.status == TransactionStatus.AUTHORIZED
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionEntity:
     """
     Domain Entity for Oneclick Mall Transaction.
 
     Aggregates multiple transaction details (one per commerce).
+
+    Details are passed at construction or appended with add_detail; those
+    are the only supported mutation paths. The running total and the
+    duplicate index are not recomputed if details is modified directly.
     """
     username: str
     buy_order: str
@@ -95,10 +157,18 @@ class TransactionEntity:
     accounting_date: Optional[str] = None
     transaction_date: Optional[datetime] = None
     created_at: Optional[datetime] = None
+    # Running sum of detail amounts, kept in step by add_detail
+    _total: int = field(default=0, init=False, repr=False, compare=False)
+    # (commerce_code, buy_order) of every detail, for O(1) duplicate checks
+    _detail_keys: set = field(default_factory=set, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate entity."""
         self._validate()
+        self._total = sum(detail.amount.value for detail in self.details)
+        self._detail_keys = {
+            (detail.commerce_code, detail.buy_order) for detail in self.details
+        }
 
     def _validate(self):
         """Business validation rules."""
@@ -116,21 +186,23 @@ class TransactionEntity:
 
     def add_detail(self, detail: TransactionDetail) -> None:
         """Add a transaction detail."""
-        if detail in self.details:
+        key = (detail.commerce_code, detail.buy_order)
+        if key in self._detail_keys:
             raise ValueError("Detail already exists in transaction")
 
+        self._detail_keys.add(key)
         self.details.append(detail)
+        self._total += detail.amount.value
 
     def get_total_amount(self) -> Amount:
         """Calculate total amount across all details."""
-        total = sum(detail.amount.value for detail in self.details)
-        return Amount(value=total)
+        return Amount(value=self._total)
 
     def is_fully_authorized(self) -> bool:
         """Check if all details were authorized."""
         if not self.details:
             return False
-        return all(detail.is_authorized() for detail in self.details)
+        return self.count_authorized() == len(self.details)
 
     def has_failed_details(self) -> bool:
         """Check if any detail failed."""
@@ -139,12 +211,17 @@ class TransactionEntity:
             for detail in self.details
         )
 
+    def iter_authorized_details(self) -> Iterator[TransactionDetail]:
+        """Iterate over authorized details without building a list."""
+        return (detail for detail in self.details if detail.is_authorized())
+
     def get_authorized_details(self) -> List[TransactionDetail]:
         """Get only authorized details."""
-        return [
-            detail for detail in self.details
-            if detail.is_authorized()
-        ]
+        return list(self.iter_authorized_details())
+
+    def count_authorized(self) -> int:
+        """Count authorized details."""
+        return sum(1 for _ in self.iter_authorized_details())
 
     def can_be_refunded(self) -> bool:
         """Check if transaction can be refunded."""
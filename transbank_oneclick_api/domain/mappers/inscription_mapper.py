@@ -6,6 +6,11 @@ from transbank_oneclick_api.domain.entities.inscription import (
 )
 from transbank_oneclick_api.models.oneclick_inscription import OneclickInscription
 
+# Column names differ between schema versions; resolve them once at import
+_HAS_URL_WEBPAY = hasattr(OneclickInscription, 'url_webpay')
+_HAS_STATUS = hasattr(OneclickInscription, 'status')
+_CARD_NUMBER_FIELD = 'card_number' if hasattr(OneclickInscription, 'card_number') else 'card_number_masked'
+
 
 class InscriptionMapper:
     """
@@ -30,31 +35,22 @@ class InscriptionMapper:
         """
         # Convert CardDetails if present
         card_details = None
-        if hasattr(orm_model, 'card_type') and hasattr(orm_model, 'card_number'):
-            if orm_model.card_type and orm_model.card_number:
-                card_details = CardDetails(
-                    card_type=orm_model.card_type,
-                    card_number=orm_model.card_number
-                )
-        elif hasattr(orm_model, 'card_number_masked') and orm_model.card_number_masked:
-            # Fallback for old schema with card_number_masked
-            if hasattr(orm_model, 'card_type') and orm_model.card_type:
-                card_details = CardDetails(
-                    card_type=orm_model.card_type,
-                    card_number=orm_model.card_number_masked
-                )
+        card_number = getattr(orm_model, _CARD_NUMBER_FIELD)
+        if orm_model.card_type and card_number:
+            card_details = CardDetails(
+                card_type=orm_model.card_type,
+                card_number=card_number
+            )
 
         # Handle status field (new schema) or is_active (old schema)
-        if hasattr(orm_model, 'status'):
-            status = InscriptionStatus(orm_model.status)
-        elif hasattr(orm_model, 'is_active'):
+        if _HAS_STATUS:
+            status = InscriptionStatus.from_wire(orm_model.status)
+        else:
             # Map is_active to status for backward compatibility
             status = InscriptionStatus.COMPLETED if orm_model.is_active else InscriptionStatus.PENDING
-        else:
-            status = InscriptionStatus.PENDING
 
         # Handle url_webpay field - use default if not available
-        url_webpay = getattr(orm_model, 'url_webpay', None)
+        url_webpay = orm_model.url_webpay if _HAS_URL_WEBPAY else None
         if not url_webpay:
             url_webpay = "https://webpay.transbank.cl"  # Default URL for inscriptions created via finish
 
@@ -94,23 +90,19 @@ class InscriptionMapper:
         )
 
         # Set url_webpay if field exists
-        if hasattr(OneclickInscription, 'url_webpay'):
+        if _HAS_URL_WEBPAY:
             orm_model.url_webpay = entity.url_webpay
 
         # Set status if field exists, otherwise use is_active
-        if hasattr(OneclickInscription, 'status'):
+        if _HAS_STATUS:
             orm_model.status = entity.status.value
-        elif hasattr(OneclickInscription, 'is_active'):
+        else:
             orm_model.is_active = (entity.status == InscriptionStatus.COMPLETED)
 
-        # Map CardDetails if present
+        # Map CardDetails if present (card_number or card_number_masked)
         if entity.card_details:
             orm_model.card_type = entity.card_details.card_type
-            # Try card_number first, then card_number_masked
-            if hasattr(OneclickInscription, 'card_number'):
-                orm_model.card_number = entity.card_details.card_number
-            elif hasattr(OneclickInscription, 'card_number_masked'):
-                orm_model.card_number_masked = entity.card_details.card_number
+            setattr(orm_model, _CARD_NUMBER_FIELD, entity.card_details.card_number)
 
         return orm_model
 
@@ -138,22 +130,18 @@ class InscriptionMapper:
         orm_model.updated_at = entity.updated_at
 
         # Set url_webpay if field exists
-        if hasattr(OneclickInscription, 'url_webpay'):
+        if _HAS_URL_WEBPAY:
             orm_model.url_webpay = entity.url_webpay
 
         # Set status if field exists, otherwise use is_active
-        if hasattr(OneclickInscription, 'status'):
+        if _HAS_STATUS:
             orm_model.status = entity.status.value
-        elif hasattr(OneclickInscription, 'is_active'):
+        else:
             orm_model.is_active = (entity.status == InscriptionStatus.COMPLETED)
 
-        # Map CardDetails if present
+        # Map CardDetails if present (card_number or card_number_masked)
         if entity.card_details:
             orm_model.card_type = entity.card_details.card_type
-            # Try card_number first, then card_number_masked
-            if hasattr(OneclickInscription, 'card_number'):
-                orm_model.card_number = entity.card_details.card_number
-            elif hasattr(OneclickInscription, 'card_number_masked'):
-                orm_model.card_number_masked = entity.card_details.card_number
+            setattr(orm_model, _CARD_NUMBER_FIELD, entity.card_details.card_number)
 
         return orm_model
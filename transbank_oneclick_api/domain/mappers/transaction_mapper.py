@@ -12,6 +12,10 @@ from transbank_oneclick_api.models.oneclick_transaction import (
     OneclickTransactionDetail
 )
 
+# Column names differ between schema versions; resolve them once at import
+_BUY_ORDER_FIELD = 'parent_buy_order' if hasattr(OneclickTransaction, 'parent_buy_order') else 'buy_order'
+_CARD_NUMBER_FIELD = 'card_number_masked' if hasattr(OneclickTransaction, 'card_number_masked') else 'card_number'
+
 
 class TransactionMapper:
     """
@@ -38,10 +42,10 @@ class TransactionMapper:
         ]
 
         # Map card_number_masked to card_number
-        card_number = getattr(orm_model, 'card_number_masked', None) or getattr(orm_model, 'card_number', None)
+        card_number = getattr(orm_model, _CARD_NUMBER_FIELD)
 
         # Map parent_buy_order to buy_order
-        buy_order = getattr(orm_model, 'parent_buy_order', None) or getattr(orm_model, 'buy_order', None)
+        buy_order = getattr(orm_model, _BUY_ORDER_FIELD)
 
         return TransactionEntity(
             id=orm_model.id,
@@ -65,10 +69,10 @@ class TransactionMapper:
             commerce_code=detail_orm.commerce_code,
             buy_order=detail_orm.buy_order,
             amount=Amount(value=detail_orm.amount),
-            status=TransactionStatus(detail_orm.status),
+            status=TransactionStatus.from_wire(detail_orm.status),
             authorization_code=detail_orm.authorization_code,
             payment_type_code=(
-                PaymentType(detail_orm.payment_type_code)
+                PaymentType.from_wire(detail_orm.payment_type_code)
                 if detail_orm.payment_type_code else None
             ),
             response_code=detail_orm.response_code,
@@ -88,7 +92,7 @@ class TransactionMapper:
         """
 
         # Generate UUID if id is not provided
-        transaction_id = entity.id if entity.id else str(uuid.uuid4())
+        transaction_id = entity.id if entity.id else uuid.uuid4().hex
         
         # Calculate total amount from details
         total_amount = sum(detail.amount.value for detail in entity.details)
@@ -101,21 +105,15 @@ class TransactionMapper:
             transaction_date=entity.transaction_date,
             created_at=entity.created_at,
             total_amount=total_amount,
-            status=entity.details[0].status.value if entity.details else TransactionStatus.AUTHORIZED.value
+            status=entity.details[0].status.to_wire() if entity.details else TransactionStatus.AUTHORIZED.to_wire()
         )
 
         # Map buy_order to parent_buy_order if field exists
-        if hasattr(OneclickTransaction, 'parent_buy_order'):
-            orm_model.parent_buy_order = entity.buy_order
-        elif hasattr(OneclickTransaction, 'buy_order'):
-            orm_model.buy_order = entity.buy_order
+        setattr(orm_model, _BUY_ORDER_FIELD, entity.buy_order)
 
         # Map card_number to card_number_masked if field exists
         if entity.card_number:
-            if hasattr(OneclickTransaction, 'card_number_masked'):
-                orm_model.card_number_masked = entity.card_number
-            elif hasattr(OneclickTransaction, 'card_number'):
-                orm_model.card_number = entity.card_number
+            setattr(orm_model, _CARD_NUMBER_FIELD, entity.card_number)
 
         # Convert details
         orm_model.details = [
@@ -132,15 +130,15 @@ class TransactionMapper:
     ) -> OneclickTransactionDetail:
         """Convert domain detail to ORM detail."""
         return OneclickTransactionDetail(
-            id=detail.id if detail.id else str(uuid.uuid4()),
+            id=detail.id if detail.id else uuid.uuid4().hex,
             transaction_id=transaction_id,
             commerce_code=detail.commerce_code,
             buy_order=detail.buy_order,
             amount=detail.amount.value,
-            status=detail.status.value,
+            status=detail.status.to_wire(),
             authorization_code=detail.authorization_code,
             payment_type_code=(
-                detail.payment_type_code.value
+                detail.payment_type_code.to_wire()
                 if detail.payment_type_code else None
             ),
             response_code=detail.response_code,
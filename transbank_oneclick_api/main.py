@@ -1,4 +1,7 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from transbank_oneclick_api.core.logging_middleware import LoggingMiddleware
@@ -10,13 +13,23 @@ from .config import settings
 from transbank_oneclick_api.schemas.response_models import ApiResponse
 
 # Setup logging
-setup_logging(log_level="DEBUG", json_logs=False)
+log_listener = setup_logging(log_level=settings.LOG_LEVEL, json_logs=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Flush queued log records before the process exits
+    log_listener.stop()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Middleware
@@ -37,6 +50,7 @@ app.add_middleware(
 # Exception handlers
 register_exception_handlers(app)
 
+
 # Routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
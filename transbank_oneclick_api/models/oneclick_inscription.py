@@ -1,15 +1,19 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Boolean, Text, func
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Index, func
 from sqlalchemy.orm import relationship
 from transbank_oneclick_api.models.base import Base
 
 
 class OneclickInscription(Base):
     __tablename__ = 'oneclick_inscriptions'
-    __table_args__ = {'schema': 'transbankoneclick'}
+    __table_args__ = (
+        # Covers the per-user card listing filtered by status
+        Index('ix_transbankoneclick_oneclick_inscriptions_username_is_active', 'username', 'is_active'),
+        {'schema': 'transbankoneclick'}
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    username = Column(String(256), nullable=False, index=True)
+    id = Column(String(36), primary_key=True, default=lambda: uuid.uuid4().hex)
+    username = Column(String(256), nullable=False)
     email = Column(String(254), nullable=True)
     tbk_user = Column(Text, nullable=False)  # Encrypted
     card_type = Column(String(50))
@@ -1,4 +1,6 @@
 import structlog
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from fastapi import Depends
@@ -11,6 +13,12 @@ from transbank_oneclick_api.domain.mappers.inscription_mapper import Inscription
 
 logger = structlog.get_logger(__name__)
 
+# Built once so every call reuses the same compiled statement from the cache
+_ACTIVE_BY_USERNAME = select(OneclickInscription).where(
+    OneclickInscription.username == bindparam("username"),
+    OneclickInscription.is_active
+).limit(1)
+
 
 class InscriptionRepository(BaseRepository[OneclickInscription]):
     """
@@ -65,10 +73,7 @@ class InscriptionRepository(BaseRepository[OneclickInscription]):
             OneclickInscription | None: ORM model or None
         """
         logger.debug("Querying active inscription", username=username)
-        return self.db.query(OneclickInscription).filter(
-            OneclickInscription.username == username,
-            OneclickInscription.is_active
-        ).first()
+        return self.db.execute(_ACTIVE_BY_USERNAME, {"username": username}).scalars().first()
 
     def get_all_by_username(self, username: str, is_active: Optional[bool] = None) -> List[OneclickInscription]:
         """
@@ -94,6 +99,36 @@ class InscriptionRepository(BaseRepository[OneclickInscription]):
         
         return query.all()
 
+    def list_cards_by_username(self, username: str, is_active: Optional[bool] = None) -> List[Row]:
+        """
+        Get the card listing columns of a user's inscriptions.
+
+        Selects only the columns the listing needs, so rows come back as
+        plain tuples without ORM hydration or identity-map bookkeeping.
+
+        Args:
+            username: Username to search
+            is_active: Optional filter for active status (None returns all)
+
+        Returns:
+            List[Row]: Rows with tbk_user, card_type, card_number_masked,
+                inscription_date, is_active and is_default
+        """
+        logger.debug("Querying card rows by username", username=username, is_active=is_active)
+        stmt = select(
+            OneclickInscription.tbk_user,
+            OneclickInscription.card_type,
+            OneclickInscription.card_number_masked,
+            OneclickInscription.inscription_date,
+            OneclickInscription.is_active,
+            OneclickInscription.is_default
+        ).where(OneclickInscription.username == username)
+
+        if is_active is not None:
+            stmt = stmt.where(OneclickInscription.is_active == is_active)
+
+        return self.db.execute(stmt).all()
+
     def find_by_username_entity(self, username: str) -> Optional[InscriptionEntity]:
         """
         Get inscription by username as Domain Entity.
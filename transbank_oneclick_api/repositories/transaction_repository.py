@@ -1,5 +1,6 @@
+import uuid
 import structlog
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, selectinload
 from typing import Optional, List
 from fastapi import Depends
 
@@ -45,17 +46,14 @@ class TransactionRepository(BaseRepository[OneclickTransaction]):
             detail_count=len(details_data)
         )
 
-        # Create transaction
+        # Details are attached through the relationship so the cascade
+        # inserts them with the transaction in a single flush
         transaction = OneclickTransaction(**transaction_data)
+        transaction.details = [
+            OneclickTransactionDetail(**{'id': uuid.uuid4().hex, **detail_data})
+            for detail_data in details_data
+        ]
         self.db.add(transaction)
-        self.db.flush()  # Get transaction ID
-
-        # Create details
-        for detail_data in details_data:
-            detail_data['transaction_id'] = transaction.id
-            detail = OneclickTransactionDetail(**detail_data)
-            self.db.add(detail)
-
         self.db.flush()
         logger.debug("Transaction and details created", transaction_id=transaction.id)
 
@@ -73,7 +71,7 @@ class TransactionRepository(BaseRepository[OneclickTransaction]):
         """
         logger.debug("Querying transaction with details", transaction_id=transaction_id)
         return self.db.query(OneclickTransaction).options(
-            joinedload(OneclickTransaction.details)
+            selectinload(OneclickTransaction.details)
         ).filter(OneclickTransaction.id == transaction_id).first()
 
     def get_by_username(
@@ -91,10 +89,12 @@ class TransactionRepository(BaseRepository[OneclickTransaction]):
             limit: Maximum number of records to return
 
         Returns:
-            List[OneclickTransaction]: List of ORM models
+            List[OneclickTransaction]: List of ORM models with details loaded
         """
         logger.debug("Querying transactions by username", username=username)
-        return self.db.query(OneclickTransaction).filter(
+        return self.db.query(OneclickTransaction).options(
+            selectinload(OneclickTransaction.details)
+        ).filter(
             OneclickTransaction.username == username
         ).order_by(OneclickTransaction.created_at.desc()).offset(skip).limit(limit).all()
 
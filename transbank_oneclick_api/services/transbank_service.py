@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 import structlog
 from sqlalchemy.orm import Session
 from fastapi import Depends
+from starlette.concurrency import run_in_threadpool
 from transbank.webpay.oneclick.mall_inscription import MallInscription
 from transbank.webpay.oneclick.mall_transaction import MallTransaction, MallTransactionAuthorizeDetails
 
@@ -21,6 +23,7 @@ from transbank_oneclick_api.domain.entities.transaction import (
 
 from ..config import settings
 from ..database import get_db
+from ..models.oneclick_inscription import OneclickInscription
 from ..repositories.inscription_repository import InscriptionRepository
 from ..repositories.transaction_repository import TransactionRepository
 from ..schemas.oneclick_schemas import (
@@ -45,6 +48,49 @@ from ..core.exceptions import (
 logger = structlog.get_logger(__name__)
 
 
+@lru_cache(maxsize=2)
+def _build_transbank_clients(
+    environment: str,
+    commerce_code: str,
+    api_key: str
+) -> Tuple[MallInscription, MallTransaction]:
+    """
+    Build the Transbank SDK clients once per configuration.
+
+    The clients only hold commerce credentials, so they are shared by every
+    TransbankService instead of being rebuilt for each request.
+
+    Args:
+        environment: "production" or any other value for integration
+        commerce_code: Mall commerce code
+        api_key: Transbank API key
+
+    Returns:
+        Tuple[MallInscription, MallTransaction]: Configured SDK clients
+    """
+    if environment == "production":
+        mall_inscription = MallInscription.build_for_production(
+            commerce_code=commerce_code,
+            api_key=api_key
+        )
+        mall_transaction = MallTransaction.build_for_production(
+            commerce_code=commerce_code,
+            api_key=api_key
+        )
+        logger.info("Transbank configured for production")
+    else:
+        mall_inscription = MallInscription.build_for_integration(
+            commerce_code=commerce_code,
+            api_key=api_key
+        )
+        mall_transaction = MallTransaction.build_for_integration(
+            commerce_code=commerce_code,
+            api_key=api_key
+        )
+        logger.info("Transbank configured for integration/testing")
+    return mall_inscription, mall_transaction
+
+
 class TransbankService:
     """
     Service layer for Transbank Oneclick operations.
@@ -77,26 +123,11 @@ class TransbankService:
 
     def _configure_transbank(self):
         """Configure Transbank SDK based on environment"""
-        if settings.TRANSBANK_ENVIRONMENT == "production":
-            self.mall_inscription = MallInscription.build_for_production(
-                commerce_code=settings.TRANSBANK_COMMERCE_CODE,
-                api_key=settings.TRANSBANK_API_KEY
-            )
-            self.mall_transaction = MallTransaction.build_for_production(
-                commerce_code=settings.TRANSBANK_COMMERCE_CODE,
-                api_key=settings.TRANSBANK_API_KEY
-            )
-            logger.info("Transbank configured for production")
-        else:
-            self.mall_inscription = MallInscription.build_for_integration(
-                commerce_code=settings.TRANSBANK_COMMERCE_CODE,
-                api_key=settings.TRANSBANK_API_KEY
-            )
-            self.mall_transaction = MallTransaction.build_for_integration(
-                commerce_code=settings.TRANSBANK_COMMERCE_CODE,
-                api_key=settings.TRANSBANK_API_KEY
-            )
-            logger.info("Transbank configured for integration/testing")
+        self.mall_inscription, self.mall_transaction = _build_transbank_clients(
+            settings.TRANSBANK_ENVIRONMENT,
+            settings.TRANSBANK_COMMERCE_CODE,
+            settings.TRANSBANK_API_KEY
+        )
 
     async def start_inscription(
         self,
@@ -136,7 +167,11 @@ class TransbankService:
                 token_prefix=response["token"][:10]
             )
 
-            return InscriptionStartResponse.model_validate(response)
+            # Both fields are plain strings from the SDK; skip re-validation
+            return InscriptionStartResponse.model_construct(
+                token=response["token"],
+                url_webpay=response["url_webpay"]
+            )
 
         except Exception as e:
             self.db.rollback()
@@ -212,8 +247,8 @@ class TransbankService:
                 card_number=response["card_number"]
             )
 
-            # 5. Convert Domain Entity to Pydantic schema
-            return InscriptionFinishResponse(
+            # 5. Convert Domain Entity to Pydantic schema (already validated)
+            return InscriptionFinishResponse.model_construct(
                 tbk_user=saved_entity.tbk_user,
                 response_code=response["response_code"],
                 authorization_code=saved_entity.authorization_code,
@@ -234,21 +269,21 @@ class TransbankService:
             )
             raise TransbankCommunicationException(str(e))
 
-    async def delete_inscription(self, tbk_user: str, username: str) -> bool:
+    async def delete_inscription(self, inscription: OneclickInscription) -> bool:
         """
         Delete card inscription (soft delete).
 
         Args:
-            tbk_user: Transbank user token
-            username: User identifier
+            inscription: Active inscription row, already looked up by the caller
 
         Returns:
             bool: Deletion confirmation
 
         Raises:
-            InscriptionNotFoundException: If inscription not found
             TransbankCommunicationException: If Transbank API call fails
         """
+        username = inscription.username
+        tbk_user = inscription.tbk_user
         try:
             logger.info(
                 "Eliminando inscripción",
@@ -256,20 +291,15 @@ class TransbankService:
                 tbk_user_prefix=tbk_user[:10]
             )
 
-            # Get inscription ORM model (not entity) for soft delete
-            inscription = self.inscription_repo.get_active_by_username(username)
-
-            if not inscription:
-                raise InscriptionNotFoundException(username)
-
-            # Delete from Transbank
-            self.mall_inscription.delete(tbk_user, username)
+            # The row is confirmed before the irreversible Transbank delete;
+            # blocking calls stay off the event loop
+            await run_in_threadpool(self.mall_inscription.delete, tbk_user, username)
 
             # Soft delete: mark as inactive in database
             inscription.is_active = False
             inscription.updated_at = datetime.now(timezone.utc)
             
-            self.db.commit()
+            await run_in_threadpool(self.db.commit)
 
             logger.info(
                 "Inscripción eliminada exitosamente",
@@ -279,8 +309,6 @@ class TransbankService:
 
             return True
 
-        except (InscriptionNotFoundException,):
-            raise
         except Exception as e:
             self.db.rollback()
             logger.error(
@@ -292,7 +320,7 @@ class TransbankService:
             )
             raise TransbankCommunicationException(str(e))
 
-    async def list_user_inscriptions(
+    def list_user_inscriptions(
         self,
         username: str,
         is_active: Optional[bool] = None
@@ -320,20 +348,20 @@ class TransbankService:
                 is_active=is_active
             )
 
-            # Get inscriptions via repository
-            inscriptions_orm = self.inscription_repo.get_all_by_username(username, is_active)
+            # Get card columns via repository
+            rows = self.inscription_repo.list_cards_by_username(username, is_active)
 
-            # Convert ORM to Pydantic
+            # Rows come from our own table, so skip Pydantic validation
             inscription_list = [
-                InscriptionInfo(
-                    tbk_user=inscription.tbk_user,
-                    card_type=inscription.card_type or "UNKNOWN",
-                    card_number=inscription.card_number_masked or "****",
-                    inscription_date=inscription.inscription_date,
-                    status="active" if inscription.is_active else "inactive",
-                    is_default=inscription.is_default or False
+                InscriptionInfo.model_construct(
+                    tbk_user=row.tbk_user,
+                    card_type=row.card_type or "UNKNOWN",
+                    card_number=row.card_number_masked or "****",
+                    inscription_date=row.inscription_date,
+                    status="active" if row.is_active else "inactive",
+                    is_default=row.is_default or False
                 )
-                for inscription in inscriptions_orm
+                for row in rows
             ]
 
             response_data = InscriptionListResponse(
@@ -451,7 +479,7 @@ class TransbankService:
                     amount=Amount(value=detail_dict["amount"]),
                     status=TransactionStatus.AUTHORIZED if detail_dict["response_code"] == 0 else TransactionStatus.FAILED,
                     authorization_code=detail_dict.get("authorization_code"),
-                    payment_type_code=PaymentType(detail_dict["payment_type_code"]) if detail_dict.get("payment_type_code") else None,
+                    payment_type_code=PaymentType.from_wire(detail_dict["payment_type_code"]) if detail_dict.get("payment_type_code") else None,
                     response_code=detail_dict.get("response_code"),
                     installments_number=detail_dict.get("installments_number")
                 )
@@ -468,7 +496,7 @@ class TransbankService:
                 "Transacción autorizada exitosamente",
                 username=username,
                 buy_order=buy_order,
-                approved_count=len(saved_entity.get_authorized_details())
+                approved_count=saved_entity.count_authorized()
             )
 
             # 9. Convert Domain Entity to Pydantic schema
@@ -820,9 +848,9 @@ class TransbankService:
                 buy_order=detail.buy_order,
                 commerce_code=detail.commerce_code,
                 amount=detail.amount.value,
-                status=detail.status.value,
+                status=detail.status.to_wire(),
                 authorization_code=detail.authorization_code,
-                payment_type_code=detail.payment_type_code.value if detail.payment_type_code else None,
+                payment_type_code=detail.payment_type_code.to_wire() if detail.payment_type_code else None,
                 response_code=detail.response_code,
                 installments_number=detail.installments_number,
                 balance=None  # Not available in domain entity